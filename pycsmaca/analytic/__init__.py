@@ -1,2 +1,2 @@
 from . import bianchi
-from .bianchi import bianchi_time
+from .bianchi import bianchi_time, bianchi_time_batch
@@ -2,32 +2,147 @@ from collections import namedtuple
 
 import numpy as np
 from scipy.optimize import fsolve
+from scipy.sparse import csr_matrix, issparse
 
 from pyqumo.distributions import SemiMarkovAbsorb, LinComb, Constant, VarChoice
 from pycsmaca.utilities import SPEED_OF_LIGHT
 
 
+def _geometric_sum(x, m):
+    """Compute `sum_{i=0}^{m-1} x^i` in the closed form.
+    """
+    if abs(x - 1.0) < 1e-15:
+        return m
+    return (1.0 - x ** m) / (1.0 - x)
+
+
+def _geometric_sum_derivative(x, m):
+    """Compute derivative of `sum_{i=0}^{m-1} x^i` by `x` in the closed form.
+    """
+    if m < 2:
+        return 0.0
+    if abs(x - 1.0) < 1e-15:
+        return m * (m - 1) / 2
+    return (1.0 - x ** m - m * x ** (m - 1) * (1.0 - x)) / (1.0 - x) ** 2
+
+
+def _bianchi_equations(p, t, n, w, m):
+    """Compute residuals of the Bianchi fixed point equations.
+    """
+    return (
+        p - (1 - (1 - t) ** (n - 1)),
+        t - 2 / (1 + w + p * w * _geometric_sum(2.0 * p, m))
+    )
+
+
+def _bianchi_jacobian(p, t, n, w, m):
+    """Compute Jacobian of `_bianchi_equations()` by `(p, t)`.
+    """
+    geo = _geometric_sum(2.0 * p, m)
+    # d(geo)/dp = 2 * d(geo)/dx, where x = 2p:
+    geo_dp = 2.0 * _geometric_sum_derivative(2.0 * p, m)
+    denom = 1 + w + p * w * geo
+    return (
+        (1.0, -(n - 1) * (1 - t) ** (n - 2) if n > 1 else 0.0),
+        (2 * w * (geo + p * geo_dp) / denom ** 2, 1.0),
+    )
+
+
+def _bianchi_newton(n, w, m, tol=1e-12, maxiter=50):
+    """Solve Bianchi equations with Newton method.
+
+    The system has only two variables, so the linear system on each step is
+    solved explicitly with plain floats. Returns `(p, tau)` or `None` if
+    the method didn't converge.
+    """
+    p, t = 0.5, 0.5
+    for _ in range(maxiter):
+        f1, f2 = _bianchi_equations(p, t, n, w, m)
+        if abs(f1) < tol and abs(f2) < tol:
+            return p, t
+        (a, b), (c, d) = _bianchi_jacobian(p, t, n, w, m)
+        det = a * d - b * c
+        if det == 0:
+            return None
+        p -= (d * f1 - b * f2) / det
+        t -= (a * f2 - c * f1) / det
+        # Keep iterations inside the domain of probabilities:
+        p = min(max(p, 0.0), 1.0)
+        t = min(max(t, 0.0), 1.0)
+    return None
+
+
+def _bianchi_newton_batch(ns, w, m, tol=1e-12, maxiter=50):
+    """Solve Bianchi equations for an array of clients numbers at once.
+
+    This is the vectorized version of `_bianchi_newton()`: each Newton step
+    is computed element-wise with NumPy. Returns arrays `(p, tau, ok)`,
+    where `ok` marks elements for which the method converged.
+    """
+    n = np.asarray(ns, dtype=float)
+    p, t = np.full(n.shape, 0.5), np.full(n.shape, 0.5)
+    ok = np.zeros(n.shape, dtype=bool)
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        for _ in range(maxiter):
+            # Geometric sum by x = 2p and its derivative (see
+            # `_geometric_sum()` and `_geometric_sum_derivative()`):
+            x = 2.0 * p
+            near_one = np.abs(x - 1.0) < 1e-15
+            x = np.where(near_one, 0.0, x)
+            geo = np.where(near_one, m, (1.0 - x ** m) / (1.0 - x))
+            if m < 2:
+                geo_dx = np.zeros(n.shape)
+            else:
+                geo_dx = np.where(
+                    near_one, m * (m - 1) / 2,
+                    (1.0 - x ** m - m * x ** (m - 1) * (1.0 - x)) /
+                    (1.0 - x) ** 2
+                )
+            denom = 1 + w + p * w * geo
+            f1 = p - (1 - (1 - t) ** (n - 1))
+            f2 = t - 2 / denom
+            ok = (np.abs(f1) < tol) & (np.abs(f2) < tol)
+            if ok.all():
+                break
+
+            # Jacobian is [[1, b], [c, 1]]:
+            b = np.where(n > 1, -(n - 1) * (1 - t) ** (n - 2), 0.0)
+            c = 2 * w * (geo + 2.0 * p * geo_dx) / denom ** 2
+            det = 1 - b * c
+            p = np.clip(p - (f1 - b * f2) / det, 0.0, 1.0)
+            t = np.clip(t - (f2 - c * f1) / det, 0.0, 1.0)
+    return p, t, ok & np.isfinite(p) & np.isfinite(t)
+
+
+def _solve_bianchi_equations(n, w, m):
+    """Find `(p, tau)` using Newton method, or `fsolve` if it fails.
+    """
+    solution = _bianchi_newton(n, w, m)
+    if solution is None:
+        args = (n, w, m)
+        solution = fsolve(
+            lambda x: _bianchi_equations(x[0], x[1], *args),
+            np.asarray((0.5, 0.5)),
+            fprime=lambda x: np.asarray(_bianchi_jacobian(x[0], x[1], *args))
+        )
+    return float(solution[0]), float(solution[1])
+
+
+def _get_num_stages(cwmin, cwmax):
+    num_stages = np.log2(cwmax / cwmin)
+    assert not (abs(num_stages - round(num_stages)) > 0)
+    return int(num_stages)
+
+
 # noinspection PyTypeChecker
 def get_bianchi_model_parameters(num_clients, cwmin, cwmax):
     # - m: number of backoff stages (number of times CW increases)
     # - p: collision probability during station transmission
     # - tau: probability that a station transmits
-    num_stages = np.log2(cwmax / cwmin)
-    assert not (abs(num_stages - round(num_stages)) > 0)
-    num_stages = int(num_stages)
-
-    def equations(variables):
-        p, t = variables
-        m, n = num_stages, num_clients
-        w = cwmin
-        return [
-            p - (1 - (1 - t) ** (n - 1)),
-            t - 2 / (1 + w + p * w * sum(pow(2 * p, i) for i in range(m)))
-        ]
-
-    solution = fsolve(equations, np.asarray((0.5, 0.5)))
-    bianchi_p = round(float(solution[0]), 10)
-    bianchi_tau = round(float(solution[1]), 10)
+    num_stages = _get_num_stages(cwmin, cwmax)
+    p, tau = _solve_bianchi_equations(num_clients, cwmin, num_stages)
+    bianchi_p = round(p, 10)
+    bianchi_tau = round(tau, 10)
 
     return namedtuple('BianchiModelParams', ['m', 'n', 'W', 'p', 'tau'])(
         num_stages, num_clients, cwmin, bianchi_p, bianchi_tau
@@ -62,6 +177,15 @@ def get_bianchi_slot_times(payload, ack, machdr, phyhdr, preamble, bitrate,
     )
 
 
+def _get_slot_mean_times(slot_times):
+    """Get mean durations of empty, data and collided slots as an array.
+    """
+    return np.asarray([
+        slot_times.empty.mean(), slot_times.data.mean(),
+        slot_times.collided.mean()
+    ])
+
+
 def get_bianchi_slot_probs(params):
     n, tau = params.n, params.tau
     result = namedtuple('BianchiSlotProbs', [
@@ -83,39 +207,52 @@ def get_bianchi_slot_probs(params):
     return result(1, 0, 0, 1 - params.p, params.p)
 
 
-def get_bianchi_time_matrix(params):
+def get_bianchi_time_matrix(params, sparse=False):
+    """Build the transitional matrix of the Bianchi backoff chain.
+
+    The matrix is very sparse: each row has at most `W * 2^m` non-zero
+    elements. If `sparse` is `True`, the matrix is returned in CSR format,
+    otherwise a dense `ndarray` is returned.
+    """
     order = params.W * (2 ** (params.m + 1) - 1)
-    get_index = get_bianchi_chain_state_index
 
-    mat = np.zeros((order, order))
+    rows, cols, values = [], [], []
     cw = params.W
     for i in range(params.m + 1):
-        for b in range(1, cw):
-            mat[get_index(i, b, params.W), get_index(i, b - 1, params.W)] = 1
+        base = get_index(i, 0, params.W)
+        backoff_states = np.arange(base + 1, base + cw)
+        rows.append(backoff_states)
+        cols.append(backoff_states - 1)
+        values.append(np.ones(cw - 1))
         if i < params.m:
             cw *= 2
             next_i = i + 1
         else:
             next_i = i
-        _p = params.p / cw
-        for b in range(cw):
-            mat[get_index(i, 0, params.W), get_index(next_i, b, params.W)] = _p
+        next_base = get_index(next_i, 0, params.W)
+        rows.append(np.full(cw, base))
+        cols.append(np.arange(next_base, next_base + cw))
+        values.append(np.full(cw, params.p / cw))
+    rows = np.concatenate(rows)
+    cols = np.concatenate(cols)
+    values = np.concatenate(values)
+
+    if sparse:
+        return csr_matrix((values, (rows, cols)), shape=(order, order))
+    mat = np.zeros((order, order))
+    mat[rows, cols] = values
     return mat
 
 
-def get_bianchi_collision_probability(params):
-    n, tau = params.n, params.tau
-    #
-    # P_tr and P_s are probabilities that slot is busy with neighbours
-    # transmission and (conditional) with successful transmission.
-    #
+def _collision_probability(tau, n):
+    # Works both with scalars and NumPy arrays (element-wise).
     p_tr = 1 - (1 - tau) ** n
     p_s = n * tau * (1 - tau) ** (n - 1) / p_tr
     return p_tr * (1 - p_s)
 
 
-def get_bianchi_throughput(params, payload_mean, t_empty, t_data, t_coll):
-    n, tau = params.n, params.tau
+def _throughput(tau, n, payload_mean, t_empty, t_data, t_coll):
+    # Works both with scalars and NumPy arrays (element-wise).
     p_tr = 1 - (1 - tau) ** n
     p_s = n * tau * (1 - tau) ** (n - 1) / p_tr
     p_c = p_tr * (1 - p_s)
@@ -123,6 +260,152 @@ def get_bianchi_throughput(params, payload_mean, t_empty, t_data, t_coll):
             (1 - p_tr) * t_empty + p_tr * p_s * t_data + p_c * t_coll)
 
 
+def get_bianchi_collision_probability(params):
+    #
+    # P_tr and P_s are probabilities that slot is busy with neighbours
+    # transmission and (conditional) with successful transmission.
+    #
+    return _collision_probability(params.tau, params.n)
+
+
+def get_bianchi_throughput(params, payload_mean, t_empty, t_data, t_coll):
+    return _throughput(
+        params.tau, params.n, payload_mean, t_empty, t_data, t_coll)
+
+
+def _generate_absorption_times(mat, state_dists, dists, p0, size):
+    """Generate absorption times of a semi-Markov process.
+
+    All `size` samples walk the chain simultaneously, so each step costs
+    a few NumPy calls instead of a Python loop iteration per sample.
+
+    :param mat: transitional matrix between transient states (dense or
+        sparse). The probability missing in each row is the probability
+        of absorption from that state;
+    :param state_dists: array of indices in `dists` for each state, defines
+        the distribution of time spent in that state;
+    :param dists: sequence of distinct time distributions;
+    :param p0: initial probability distribution over transient states;
+    :param size: number of samples to generate.
+    :return: `ndarray` of absorption times.
+    """
+    if issparse(mat):
+        mat = mat.tocsr()
+        # Explicit zeros (e.g. `p = 0`) are dropped from a copy only, so the
+        # caller matrix is not modified:
+        if np.any(mat.data == 0):
+            mat = mat.copy()
+            mat.eliminate_zeros()
+    else:
+        mat = csr_matrix(mat)
+    order = mat.shape[0]
+    indptr, indices = mat.indptr, mat.indices
+
+    # For each non-zero we compute a key `row + cumulative probability in row`.
+    # Then for a walker in state `s` and a uniform `u`, the next state index
+    # is found as `searchsorted(keys, s + u)`; if it falls outside the row
+    # `s`, the walker is absorbed.
+    row_of_nz = np.repeat(np.arange(order), np.diff(indptr))
+    cum_probs = np.cumsum(mat.data)
+    row_offsets = np.concatenate(([0.0], cum_probs))[indptr[:-1]]
+    keys = row_of_nz + np.minimum(cum_probs - row_offsets[row_of_nz], 1.0)
+
+    state_dists = np.asarray(state_dists)
+
+    times = np.zeros(size)
+    walkers = np.arange(size)
+    states = np.searchsorted(
+        np.cumsum(p0), np.random.uniform(size=size), side='right')
+    states = np.minimum(states, order - 1)
+
+    while walkers.size > 0:
+        # 1) Add time spent in the current states, generating samples of
+        # each distribution with a single call:
+        walker_dists = state_dists[states]
+        for i, dist in enumerate(dists):
+            selected = walker_dists == i
+            num_selected = np.count_nonzero(selected)
+            if num_selected > 0:
+                times[walkers[selected]] += np.asarray(
+                    dist.generate(num_selected)).reshape(num_selected)
+
+        # 2) Select next states and drop absorbed walkers:
+        nz_index = np.searchsorted(
+            keys, states + np.random.uniform(size=states.size), side='right')
+        moved = nz_index < indptr[states + 1]
+        walkers = walkers[moved]
+        states = indices[nz_index[moved]]
+
+    return times
+
+
+def _get_bianchi_state_dists(params, slot_times, slot_probs):
+    """Build time distributions of the Bianchi absorbing process states.
+
+    Distributions are stored as a small tuple of distinct distributions
+    and an `int8` array of their indices per state:
+
+    - NO_TIME: states where no time is spent;
+    - WAIT_SLOT: backoff states, station waits for a slot;
+    - TRANS_SLOT: transmission states.
+
+    Both are built once and shared by the sampler and the lazily built
+    `SemiMarkovAbsorb` process.
+
+    :return: a tuple `(dists, state_dists)`.
+    """
+    NO_TIME, WAIT_SLOT, TRANS_SLOT = 0, 1, 2
+    dists = (
+        Constant(0),
+        VarChoice(
+            [slot_times.empty, slot_times.data, slot_times.collided],
+            [slot_probs.wait_slot_empty, slot_probs.wait_slot_success,
+             slot_probs.wait_slot_collided]
+        ),
+        VarChoice(
+            [slot_times.collided, slot_times.data],
+            [slot_probs.trans_slot_collided, slot_probs.trans_slot_success],
+        ),
+    )
+    order = params.W * (2 ** (params.m + 1) - 1)
+    state_dists = np.full(order, NO_TIME, dtype=np.int8)
+    for i in range(params.m):
+        cw = params.W * (2 ** i)
+        base = get_bianchi_chain_state_index(i, 0, params.W)
+        state_dists[base + 1:base + cw] = WAIT_SLOT
+        state_dists[base] = TRANS_SLOT
+    return dists, state_dists
+
+
+class BianchiTimeRet:
+    """Result of `bianchi_time()`: service time `mean` and `std`,
+    `p_collision` and `throughput`.
+
+    `process` (`SemiMarkovAbsorb`) is built on first access only. Samples
+    are generated without it, while it needs a dense matrix and a list of
+    distributions per state, which are expensive for large `cwmax`.
+    """
+    def __init__(self, mean, std, p_collision, throughput, process_args):
+        self.mean = mean
+        self.std = std
+        self.p_collision = p_collision
+        self.throughput = throughput
+        self.__process_args = process_args
+        self.__process = None
+
+    @property
+    def process(self):
+        if self.__process is None:
+            mat, state_dists, dists, p0 = self.__process_args
+            # Per-state list shares the distinct distribution objects and
+            # is built by a single `take()`:
+            dists_array = np.empty(len(dists), dtype=object)
+            dists_array[:] = dists
+            time_dists = dists_array.take(state_dists).tolist()
+            self.__process = SemiMarkovAbsorb(mat.toarray(), time_dists, p0)
+        return self.__process
+
+
 def bianchi_time(
         num_clients, payload_size, ack_size, mac_header_size, phy_header_size,
         preamble, bitrate, difs, sifs, slot, cwmin, cwmax, distance=100,
@@ -136,8 +419,7 @@ def bianchi_time(
     # 2) Build the transitional stochastic matrix for absorbing process:
     #
     order = bianchi.W * (2 ** (bianchi.m + 1) - 1)
-    get_index = get_bianchi_chain_state_index
-    mat = get_bianchi_time_matrix(bianchi)
+    mat = get_bianchi_time_matrix(bianchi, sparse=True)
 
     #
     # 3) Build waiting time distributions and slot type probabilities:
@@ -148,31 +430,13 @@ def bianchi_time(
     )
     slot_probs = get_bianchi_slot_probs(bianchi)
 
-    time_dists = [Constant(0)] * order
-    for i in range(bianchi.m):
-        cw = cwmin * (2 ** i)
-        for b in range(1, cw):
-            time_dists[get_index(i, b, cwmin)] = VarChoice(
-                [slot_times.empty, slot_times.data, slot_times.collided],
-                [slot_probs.wait_slot_empty, slot_probs.wait_slot_success,
-                 slot_probs.wait_slot_collided]
-            )
-        time_dists[get_index(i, 0, cwmin)] = VarChoice(
-            [slot_times.collided, slot_times.data],
-            [slot_probs.trans_slot_collided, slot_probs.trans_slot_success],
-        )
-
-    p0 = [1 / cwmin] * cwmin + [0] * (order - cwmin)
+    dists, state_dists = _get_bianchi_state_dists(
+        bianchi, slot_times, slot_probs)
 
-    process = SemiMarkovAbsorb(mat, time_dists, p0)
-    # print('Params: ', bianchi)
-    # print(mat)
-    # for it, d in enumerate(time_dists):
-    #     print(f'{it}: ', d)
-    samples = process.generate(1000)
+    p0 = np.zeros(order)
+    p0[:cwmin] = 1.0 / cwmin
 
-    simret = namedtuple('SimRet', ['mean', 'std', 'process', 'p_collision',
-                                   'throughput'])
+    samples = _generate_absorption_times(mat, state_dists, dists, p0, 1000)
     p_collision = get_bianchi_collision_probability(bianchi)
 
     try:
@@ -181,11 +445,79 @@ def bianchi_time(
         _payload_mean = payload_size
 
     throughput = get_bianchi_throughput(
-        bianchi, _payload_mean, slot_times.empty.mean(), slot_times.data.mean(),
-        slot_times.collided.mean()
+        bianchi, _payload_mean, *_get_slot_mean_times(slot_times))
+    return BianchiTimeRet(
+        samples.mean(), samples.std(), p_collision, throughput,
+        (mat, state_dists, dists, p0)
+    )
+
+
+def bianchi_time_batch(
+        nums_clients, payload_size, ack_size, mac_header_size,
+        phy_header_size, preamble, bitrate, difs, sifs, slot, cwmin, cwmax,
+        distance=100, c=SPEED_OF_LIGHT):
+    """Evaluate Bianchi model for many numbers of clients at once.
+
+    Unlike `bianchi_time()`, no samples are generated: the mean service
+    time is the mean absorption time of the same chain, computed in the
+    closed form. All values are computed with NumPy for all elements of
+    `nums_clients` simultaneously.
+
+    :return: a tuple of arrays `(num_clients, p, tau, mean, p_collision,
+        throughput)`.
+    """
+    n = np.asarray(nums_clients, dtype=float)
+    m = _get_num_stages(cwmin, cwmax)
+
+    #
+    # 1) Solve the fixed point equations. Elements, for which vectorized
+    #    Newton method didn't converge, are solved one by one:
+    #
+    p, tau, ok = _bianchi_newton_batch(n, cwmin, m)
+    for i in np.flatnonzero(~ok):
+        p[i], tau[i] = _solve_bianchi_equations(n[i], cwmin, m)
+    p, tau = np.round(p, 10), np.round(tau, 10)
+
+    #
+    # 2) Find mean slot times and slot type probabilities
+    #    (see `get_bianchi_slot_probs()`):
+    #
+    slot_times = get_bianchi_slot_times(
+        payload_size, ack_size, mac_header_size, phy_header_size, preamble,
+        bitrate, difs, sifs, slot, distance, c
+    )
+    t_empty, t_data, t_coll = _get_slot_mean_times(slot_times)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        p_tr = 1 - (1 - tau) ** (n - 1)
+        p_s = np.where(
+            n > 1, (n - 1) * tau * (1 - tau) ** (n - 2) / p_tr, 0.0)
+    p_tr = np.where(n > 1, p_tr, 0.0)
+    t_wait = ((1 - p_tr) * t_empty + p_tr * p_s * t_data +
+              p_tr * (1 - p_s) * t_coll)
+    t_trans = (1 - p) * t_data + p * t_coll
+
+    #
+    # 3) Stage `i < m` is visited with probability `p^i`. It takes
+    #    `(W_i - 1) / 2` waiting slots on average and a transmission slot.
+    #    No time is spent at the last stage (as in `bianchi_time()`):
+    #
+    mean = np.zeros(n.shape)
+    for i in range(m):
+        cw = cwmin * (2 ** i)
+        mean += p ** i * ((cw - 1) / 2 * t_wait + t_trans)
+
+    try:
+        _payload_mean = payload_size.mean()
+    except AttributeError:
+        _payload_mean = payload_size
+
+    return namedtuple('BianchiBatchRet', [
+        'num_clients', 'p', 'tau', 'mean', 'p_collision', 'throughput'
+    ])(
+        n.astype(int), p, tau, mean, _collision_probability(tau, n),
+        _throughput(tau, n, _payload_mean, t_empty, t_data, t_coll)
     )
-    return simret(samples.mean(), samples.std(), process, p_collision,
-                  throughput)
 
 
 if __name__ == '__main__':
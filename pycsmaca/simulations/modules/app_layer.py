@@ -1,14 +1,19 @@
 from pydesim import Model, Intervals, Statistic
 
-from pycsmaca.utilities import ReadOnlyDict
+from pycsmaca.utilities import ReadOnlyDict, is_debug_enabled
 
 
 class AppData:
+    __slots__ = (
+        '__dest_addr', '__size', '__source_id', '__created_at', '__str',
+    )
+
     def __init__(self, dest_addr=0, size=0, source_id=0, created_at=0):
         self.__dest_addr = dest_addr
         self.__size = size
         self.__source_id = source_id
         self.__created_at = created_at
+        self.__str = None  # AppData is immutable, so the string is cached
 
     @property
     def destination_address(self):
@@ -27,11 +32,47 @@ class AppData:
         return self.__created_at
 
     def __str__(self):
-        fields = ','.join([
-            f'sid={self.source_id}', f'dst={self.destination_address}',
-            f'size={self.size}', f'ct={self.created_at}'
-        ])
-        return f'AppData{{{fields}}}'
+        if self.__str is None:
+            self.__str = (
+                f'AppData{{sid={self.__source_id},dst={self.__dest_addr},'
+                f'size={self.__size},ct={self.__created_at}}}'
+            )
+        return self.__str
+
+
+def _make_generator(value):
+    """Build a zero-argument callable drawing the next value.
+
+    Iterables are preferred, then callables, otherwise `value` is treated
+    as a constant. When an iterable is exhausted, `StopIteration` is raised.
+    """
+    try:
+        return iter(value).__next__
+    except TypeError:
+        pass
+    if callable(value):
+        return value
+    return lambda: value
+
+
+def _make_batch_generator(value, n):
+    """Build a zero-argument callable drawing values in batches of `n`.
+
+    Batches are drawn with `value.generate(n)` (e.g., `pyqumo` distributions
+    provide this method). If `value` has no such method, `None` is returned.
+    An empty batch stops drawing (`StopIteration` is raised).
+    """
+    generate = getattr(value, 'generate', None)
+    if not callable(generate):
+        return None
+
+    def values():
+        while True:
+            batch = generate(n)
+            if len(batch) == 0:
+                return
+            yield from batch
+    return values().__next__
 
 
 class _SourceBase(Model):
@@ -49,11 +90,10 @@ class _SourceBase(Model):
         self.__source_id = source_id
         self.__dest_addr = dest_addr
 
-        # Attempt to build iterators for data size and intervals:
-        try:
-            self.__data_size_iter = iter(self.__data_size)
-        except TypeError:
-            self.__data_size_iter = None
+        self.__debug = is_debug_enabled(sim.logger)
+
+        # Resolve how data sizes are drawn once:
+        self.__next_size = _make_generator(data_size)
 
         # Statistics:
         self.__arrival_intervals = Intervals()
@@ -84,9 +124,19 @@ class _SourceBase(Model):
     def num_packets_sent(self):
         return self.__num_packets_sent
 
+    def precompute(self, n):
+        """Draw data sizes in batches of `n` values.
+
+        Has effect only if `data_size` provides `generate(size)` method,
+        other distributions are drawn value by value.
+        """
+        next_size = _make_batch_generator(self.__data_size, n)
+        if next_size is not None:
+            self.__next_size = next_size
+
     def _generate(self):
         try:
-            data_size = self.__get_next_size()
+            data_size = self.__next_size()
         except StopIteration:
             return False # do nothing if stop iteration fired
         else:
@@ -99,17 +149,11 @@ class _SourceBase(Model):
             self.arrival_intervals.record(self.sim.stime)
             self.data_size_stat.append(data_size)
             self.__num_packets_sent += 1
-            self.sim.logger.debug(f'generated new packet {app_data}', src=self)
+            if self.__debug:
+                self.sim.logger.debug(
+                    f'generated new packet {app_data}', src=self)
             return True
 
-    def __get_next_size(self):
-        if self.__data_size_iter:
-            return next(self.__data_size_iter)
-        try:
-            return self.data_size()
-        except TypeError:
-            return self.data_size
-
     def __str__(self):
         prefix = f'{self.parent}.' if self.parent else ''
         return f'{prefix}Source({self.source_id})'
@@ -139,7 +183,8 @@ class RandomSource(_SourceBase):
     - 'network': connected network layer module; should implement
         `handle_message(app_data)` method.
     """
-    def __init__(self, sim, data_size, interval, source_id, dest_addr):
+    def __init__(self, sim, data_size, interval, source_id, dest_addr,
+                 burst=None):
         """Create `RandomSource` module.
 
         :param sim: `pydesim.Simulator` object;
@@ -148,37 +193,85 @@ class RandomSource(_SourceBase):
         :param interval: callable without arguments, iterable or constant;
             represents inter-arrival intervals distribution;
         :param source_id: this source ID (more like IP address, not MAC)
-        :param dest_addr: destination MAC address.
+        :param dest_addr: destination MAC address;
+        :param burst: if given, arrivals are scheduled in bursts of this size
+            (refilled when less than a half of them remains pending),
+            otherwise each arrival schedules the next one.
         """
         super().__init__(sim, data_size, source_id, dest_addr)
         self.__interval = interval
+        self.__burst = burst
+        self.__num_scheduled = 0
+        self.__scheduled_until = sim.stime
+        self.__intervals_exhausted = False
+        self.__data_exhausted = False
 
-        # Attempt to build iterators for data size and intervals:
-        try:
-            self.__interval_iter = iter(self.__interval)
-        except TypeError:
-            self.__interval_iter = None
+        # Resolve how intervals are drawn once:
+        self.__next_interval = _make_generator(interval)
 
         # Initialize:
-        self._schedule_next_arrival()
+        if burst:
+            self._schedule_burst(burst)
+        else:
+            self._schedule_next_arrival()
 
     @property
     def interval(self):
         return self.__interval
 
+    def precompute(self, n):
+        """Draw data sizes and intervals in batches of `n` values.
+
+        Has effect only for distributions providing `generate(size)`.
+        The first arrival is scheduled in constructor, so batches are
+        used for intervals starting from the second arrival.
+        """
+        super().precompute(n)
+        next_interval = _make_batch_generator(self.__interval, n)
+        if next_interval is not None:
+            self.__next_interval = next_interval
+
     def _generate(self):
+        if self.__burst:
+            return self._generate_in_burst()
         if super()._generate():
             self._schedule_next_arrival()
             return True
         return False
 
+    def _generate_in_burst(self):
+        self.__num_scheduled -= 1
+        # Arrivals already scheduled still fire after data sizes are
+        # exhausted, but they neither draw nor schedule anything:
+        if self.__data_exhausted:
+            return False
+        if not super()._generate():
+            self.__data_exhausted = True
+            return False
+        burst = self.__burst
+        if (2 * self.__num_scheduled < burst and
+                not self.__intervals_exhausted):
+            self._schedule_burst(burst)
+        return True
+
     def _get_next_interval(self):
-        if self.__interval_iter is not None:
-            return next(self.__interval_iter)
-        try:
-            return self.interval()
-        except TypeError:
-            return self.interval
+        return self.__next_interval()
+
+    def _schedule_burst(self, k):
+        """Schedule up to `k` arrivals following the last scheduled one."""
+        schedule, handler = self.sim.schedule, self._generate
+        stime = self.sim.stime
+        t = max(self.__scheduled_until, stime)
+        next_interval = self.__next_interval
+        for _ in range(k):
+            try:
+                t += next_interval()
+            except StopIteration:
+                self.__intervals_exhausted = True
+                break
+            schedule(t - stime, handler)
+            self.__num_scheduled += 1
+        self.__scheduled_until = t
 
     def _schedule_next_arrival(self):
         try:
@@ -250,6 +343,7 @@ class Sink(Model):
         self.__arrival_intervals = Intervals()
         self.__data_size_stat = Statistic()
         self.__num_packets_received = 0
+        self.__debug = is_debug_enabled(sim.logger)
 
     @property
     def arrival_intervals(self):
@@ -268,14 +362,18 @@ class Sink(Model):
         return self.__num_packets_received
 
     def handle_message(self, app_data, sender=None, connection=None):
+        stime = self.sim.stime
         sid = app_data.source_id
-        if sid not in self.source_delays:
-            self.__source_delays_data[sid] = Statistic()
-        self.source_delays[sid].append(self.sim.stime - app_data.created_at)
-        self.arrival_intervals.record(self.sim.stime)
-        self.data_size_stat.append(app_data.size)
+        try:
+            delays = self.__source_delays_data[sid]
+        except KeyError:
+            delays = self.__source_delays_data[sid] = Statistic()
+        delays.append(stime - app_data.created_at)
+        self.__arrival_intervals.record(stime)
+        self.__data_size_stat.append(app_data.size)
         self.__num_packets_received += 1
-        self.sim.logger.debug(f'received {app_data}', src=self)
+        if self.__debug:
+            self.sim.logger.debug(f'received {app_data}', src=self)
 
     def __str__(self):
         prefix = f'{self.parent}.' if self.parent else ''
@@ -1,6 +1,6 @@
 from pydesim import Model
 
-from pycsmaca.utilities import ReadOnlyDict
+from pycsmaca.utilities import ReadOnlyDict, is_debug_enabled
 
 
 class NetworkPacket:
@@ -28,6 +28,11 @@ class NetworkPacket:
     `NetworkPacket` can also handle a payload (`data`), which is expected
     to be `AppData`.
     """
+    __slots__ = (
+        'destination_address', 'originator_address', 'sender_address',
+        'receiver_address', 'osn', 'data',
+    )
+
     def __init__(
             self, destination_address=None, originator_address=None,
             receiver_address=None, sender_address=None, osn=None, data=None):
@@ -40,7 +45,8 @@ class NetworkPacket:
 
     @property
     def size(self):
-        return self.data.size if self.data else 0
+        data = self.data
+        return data.size if data is not None else 0
 
     def __str__(self):
         fields = []
@@ -83,14 +89,26 @@ class NetworkService(Model):
     """
     def __init__(self, sim):
         super().__init__(sim)
+        # Connections are cached on first use, since they are usually set
+        # after the module is created:
+        self.__source_conn = None
+        self.__network_conn = None
 
     def handle_message(self, message, connection=None, sender=None):
-        if connection == self.connections.get('source'):
+        source_conn = self.__source_conn
+        if source_conn is None:
+            source_conn = self.__source_conn = self.connections.get('source')
+        if connection is source_conn:
             packet = NetworkPacket(
                 destination_address=message.destination_address, data=message
             )
             self.connections['network'].send(packet)
-        elif connection == self.connections.get('network'):
+            return
+        network_conn = self.__network_conn
+        if network_conn is None:
+            network_conn = self.__network_conn = \
+                self.connections.get('network')
+        if connection is network_conn:
             self.connections['sink'].send(message.data)
 
     def __str__(self):
@@ -112,26 +130,67 @@ class SwitchTable:
     Records MAY be updated later during the simulation.
     """
     class Link:
-        def __init__(self, connection, next_hop):
-            self.connection = connection
-            self.next_hop = next_hop
+        __slots__ = ('__connection', '__next_hop', '__on_change')
+
+        def __init__(self, connection, next_hop, on_change=None):
+            self.__connection = connection
+            self.__next_hop = next_hop
+            self.__on_change = on_change
+
+        @property
+        def connection(self):
+            return self.__connection
+
+        @connection.setter
+        def connection(self, value):
+            self.__connection = value
+            if self.__on_change is not None:
+                self.__on_change()
+
+        @property
+        def next_hop(self):
+            return self.__next_hop
+
+        @next_hop.setter
+        def next_hop(self, value):
+            self.__next_hop = value
+            if self.__on_change is not None:
+                self.__on_change()
 
         def as_tuple(self):
-            return self.connection, self.next_hop
+            return self.__connection, self.__next_hop
 
         def __str__(self):
             return f'conn={self.connection}, next_hop={self.next_hop}'
 
     def __init__(self):
         self.__records = {}
+        self.__listeners = []
+        self.__cached_view = None  # dropped on any record change
 
     def add(self, dst, connection, next_hop):
-        self.__records[dst] = SwitchTable.Link(connection, next_hop)
+        self.__records[dst] = SwitchTable.Link(
+            connection, next_hop, self.__handle_change)
+        self.__handle_change()
+
+    def add_listener(self, listener):
+        """Register a callable invoked without arguments on any change.
+
+        Listeners are called after `add()` and after any `Link` update.
+        """
+        self.__listeners.append(listener)
 
     def as_dict(self):
-        return ReadOnlyDict({
-            dst: link.as_tuple() for dst, link in self.__records.items()
-        })
+        if self.__cached_view is None:
+            self.__cached_view = ReadOnlyDict({
+                dst: link.as_tuple() for dst, link in self.__records.items()
+            })
+        return self.__cached_view
+
+    def __handle_change(self):
+        self.__cached_view = None
+        for listener in self.__listeners:
+            listener()
 
     def __getitem__(self, dst):
         return self.__records[dst]
@@ -180,14 +239,58 @@ class NetworkSwitch(Model):
         super().__init__(sim)
         self.__table = SwitchTable()
         self.__osn_table = {}
+        self.__debug = is_debug_enabled(sim.logger)
+        # Forwarding plan: `destination_address -> (link, iface)`, where
+        # `iface` is the connection to the interface the packet is forwarded
+        # to. Unknown destinations are mapped to `None`. Connected modules
+        # are resolved once, when the first packet is handled, while their
+        # addresses are checked on each packet, since they may change.
+        # The plan is dropped when the table changes or `invalidate_plan()`
+        # is called:
+        self.__plan = {}
+        self.__local_modules = None
+        self.__table.add_listener(self.invalidate_plan)
 
     @property
     def table(self):
         return self.__table
 
-    def handle_message(self, message, connection=None, sender=None):
-        assert isinstance(message, NetworkPacket)
+    def invalidate_plan(self):
+        """Drop the forwarding plan and the connected modules list.
+
+        MUST be called if connections change after the switch handled its
+        first packet. Routing table and interface address changes are
+        tracked automatically.
+        """
+        self.__plan = {}
+        self.__local_modules = None
+
+    def _is_local_address(self, address):
+        modules = self.__local_modules
+        if modules is None:
+            modules = self.__local_modules = tuple(
+                module for module in self.connections.as_dict().values()
+                if hasattr(module, 'address')
+            )
+        for module in modules:
+            if module.address == address:
+                return True
+        return False
+
+    def _get_plan(self, address):
+        try:
+            return self.__plan[address]
+        except KeyError:
+            pass
+        link = self.__table.get(address)
+        if link is None:
+            entry = None
+        else:
+            entry = (link, self.connections[link.connection])
+        self.__plan[address] = entry
+        return entry
 
+    def handle_message(self, message, connection=None, sender=None):
         # 1) Check source sequence number (SSN):
         # - if the switch never received packets from that originator
         #   (`originator_address`), it fills its OSN table with the `osn` from
@@ -198,27 +301,23 @@ class NetworkSwitch(Model):
         # - if the switch ever received packets from the originator, but the
         #   stored OSN is greater or equal to the received one, it drops the
         #   packet silently and stops serving.
-        if message.originator_address is not None:
-            assert message.osn is not None
+        originator = message.originator_address
+        if originator is not None:
+            osn = message.osn
+            assert osn is not None
             # Check that this message is not too old by checking its SSN:
-            if message.originator_address not in self.__osn_table:
-                self.__osn_table[message.originator_address] = message.osn
-            elif message.osn <= self.__osn_table[message.originator_address]:
+            osn_table = self.__osn_table
+            last_osn = osn_table.get(originator)
+            if last_osn is not None and osn <= last_osn:
                 return  # do not process this message due to old SSN
-            else:
-                self.__osn_table[message.originator_address] = message.osn
+            osn_table[originator] = osn
 
         # 2) By using the destination address, the Switch checks whether
         # ANY of its connected interface has the given address. If such
         # interface found, it means that the message destination is the
         # station the switch is contained in, so it sends the message up to
         # `NetworkService` for decapsulation and sending then it up to a user.
-        for _, module in self.connections.as_dict().items():
-            if (hasattr(module, 'address') and
-                    module.address == message.destination_address):
-                self.connections['user'].send(message)
-                return
-
+        #
         # 3) If an interface with destination address not found, the switch
         # tries to forward the packet. It looks up its switching table to
         # find a record for the given destination:
@@ -227,10 +326,16 @@ class NetworkSwitch(Model):
         #
         # - if not found, the packet is silently dropped and the forwarding
         #   service is stopped.
-        link = self.table.get(message.destination_address)
-        if link is None:
+        #
+        # Forwarding records are memoized per destination in the plan.
+        destination = message.destination_address
+        if self._is_local_address(destination):
+            self.connections['user'].send(message)
             return
-        iface_connection = self.connections[link.connection]
+        plan = self._get_plan(destination)
+        if plan is None:
+            return
+        link, iface_connection = plan
 
         # 4) Now the switch checks whether the packet came from the user
         # (`NetworkService`):
@@ -263,10 +368,11 @@ class NetworkSwitch(Model):
         message.receiver_address = link.next_hop
         message.sender_address = iface_connection.module.address
         iface_connection.send(message)
-        self.sim.logger.debug(
-            f'forward packet {message} from connection {connection.name} '
-            f'to {iface_connection.name}', src=self
-        )
+        if self.__debug:
+            self.sim.logger.debug(
+                f'forward packet {message} from connection {connection.name} '
+                f'to {iface_connection.name}', src=self
+            )
 
     def __str__(self):
         prefix = f'{self.parent}.' if self.parent is not None else ''
@@ -2,16 +2,19 @@ from collections import deque
 
 from pydesim import Model, Trace, Intervals, Statistic
 
+from pycsmaca.utilities import OnlineStatistic
+
 
 class QueuedPacket:
+    __slots__ = ('packet', 'arrived_at', 'size')
+
     def __init__(self, packet, arrived_at):
         self.packet = packet
         self.arrived_at = arrived_at
-    
-    @property
-    def size(self):
-        return self.packet.size
-    
+        # Size is read when the packet is stored, so the same value is
+        # added to and subtracted from the queue bitsize:
+        self.size = packet.size
+
     def __str__(self):
         return ('QPkt('
                 f'{self.packet.sender_address}->{self.packet.receiver_address}'
@@ -60,12 +63,47 @@ class Queue(Model):
     > NOTE: queue can also be accessed with `push()` and `pop()` methods,
     so in some cases producers and services may use this module directly,
     without connections (and without `get_next()` also in this case).
+
+    Size traces are recorded according to `trace_mode`:
+
+    - `'all'` (default): a sample is recorded on each store and pop;
+
+    - `'coalesce'`: samples taken at the same simulation time are merged,
+        only the last one is kept;
+
+    - `'change'`: like `'coalesce'`, but a merged sample with the same size
+        and bitsize as the previously recorded one is skipped (e.g., when
+        a packet is pushed and popped at the same time).
+
+    Since traces are piecewise-constant, time averages computed from them
+    are the same in all modes.
+
+    Waiting times are stored in a `pydesim.Statistic`. If `online_stats` is
+    `True`, an `OnlineStatistic` is used instead, which keeps no samples
+    (only mean and deviation).
     """
-    def __init__(self, sim, capacity=None):
+    TRACE_MODES = ('all', 'coalesce', 'change')
+
+    def __init__(self, sim, capacity=None, trace_mode='all',
+                 online_stats=False):
         super().__init__(sim)
+        if trace_mode not in Queue.TRACE_MODES:
+            raise ValueError(f'unsupported trace mode "{trace_mode}"')
+        self.__trace_mode = trace_mode
         self.__capacity = capacity
-        self.__packets = deque()
-        self.__data_requests = deque()
+        # Unbounded queue stores packets in a deque, while a bounded one uses
+        # a preallocated ring buffer to avoid allocations on push and pop:
+        self.__packets = deque() if capacity is None else None
+        self.__ring = [None] * capacity if capacity is not None else None
+        self.__head = 0
+        self.__size = 0
+        self.__bitsize = 0  # total size of stored packets
+        # The first pending request is kept separately, since usually there
+        # is at most one service waiting; others wait in the deque, which is
+        # created when the second request arrives:
+        self.__pending_request = None
+        self.__data_requests = None
+        self.__conn_cache = {}  # id(peer) -> connection, built lazily
         # Statistics:
         self.__num_dropped = 0
         self.__num_arrived = 0
@@ -73,9 +111,12 @@ class Queue(Model):
         self.__bitsize_trace = Trace()
         self.__size_trace.record(sim.stime, 0)
         self.__bitsize_trace.record(sim.stime, 0)
+        self.__last_sample = (sim.stime, 0, 0)  # (time, size, bitsize)
+        self.__pending_sample = None  # used in 'coalesce' and 'change' modes
         self.__arrival_intervals = Intervals()
         self.__arrival_intervals.record(self.sim.stime)
-        self.__wait_intervals = Statistic()
+        self.__wait_intervals = (
+            OnlineStatistic() if online_stats else Statistic())
 
     @property
     def capacity(self):
@@ -95,12 +136,18 @@ class Queue(Model):
             return self.__num_dropped / self.__num_arrived
         return 0
 
+    @property
+    def trace_mode(self):
+        return self.__trace_mode
+
     @property
     def size_trace(self):
+        self.__flush_pending_sample()
         return self.__size_trace
 
     @property
     def bitsize_trace(self):
+        self.__flush_pending_sample()
         return self.__bitsize_trace
     
     @property
@@ -118,59 +165,167 @@ class Queue(Model):
         return len(self) == self.capacity
 
     def __len__(self):
-        return len(self.__packets)
+        return self.__size
 
     def size(self):
         return len(self)
 
     def bitsize(self):
-        return sum(pkt.size for pkt in self.__packets)
+        return self.__bitsize
 
     def as_tuple(self):
-        return tuple(self.__packets)
+        if self.__ring is None:
+            return tuple(self.__packets)
+        ring, head = self.__ring, self.__head
+        end = head + self.__size
+        if end <= len(ring):
+            return tuple(ring[head:end])
+        return tuple(ring[head:] + ring[:end - len(ring)])
 
     def push(self, packet):
+        stime = self.sim.stime
         self.__num_arrived += 1
-        self.__arrival_intervals.record(self.sim.stime)
-        if self.__data_requests:
-            connection = self.__data_requests.popleft()
+        self.__arrival_intervals.record(stime)
+        connection = self.__pending_request
+        if connection is not None:
+            requests = self.__data_requests
+            self.__pending_request = requests.popleft() if requests else None
             connection.send(packet)
             self.__wait_intervals.append(0.0)
-        else:
-            if self.capacity is None or len(self) < self.capacity:
-                qp = QueuedPacket(packet, arrived_at=self.sim.stime)
-                self.__packets.append(qp)
-                self.__size_trace.record(self.sim.stime, len(self))
-                self.__bitsize_trace.record(self.sim.stime, self.bitsize())
-            else:
-                self.__num_dropped += 1
+        elif self.__put(packet, stime):
+            self._record_traces(stime)
+
+    def push_many(self, packets):
+        """Push several packets arrived at the same time.
+
+        Pending requests are served first, other packets are stored (or
+        dropped, if the queue is full). Size traces are recorded once.
+        """
+        stime = self.sim.stime
+        num_stored = 0
+        for packet in packets:
+            self.__num_arrived += 1
+            self.__arrival_intervals.record(stime)
+            connection = self.__pending_request
+            if connection is not None:
+                requests = self.__data_requests
+                self.__pending_request = (
+                    requests.popleft() if requests else None)
+                connection.send(packet)
+                self.__wait_intervals.append(0.0)
+            elif self.__put(packet, stime):
+                num_stored += 1
+        if num_stored > 0:
+            self._record_traces(stime)
 
     def pop(self):
-        try:
+        if self.__size == 0:
+            raise ValueError('pop from empty Queue')
+        stime = self.sim.stime
+        qp = self.__take()
+        self._record_traces(stime)
+        self.__wait_intervals.append(stime - qp.arrived_at)
+        return qp.packet
+
+    def pop_many(self, max_num=None):
+        """Pop up to `max_num` packets (all packets, if `max_num` is `None`).
+
+        Size traces are recorded once.
+        """
+        num = self.__size if max_num is None else min(max_num, self.__size)
+        if num == 0:
+            return []
+        stime = self.sim.stime
+        packets = []
+        for _ in range(num):
+            qp = self.__take()
+            self.__wait_intervals.append(stime - qp.arrived_at)
+            packets.append(qp.packet)
+        self._record_traces(stime)
+        return packets
+
+    def __put(self, packet, stime):
+        # Store the packet, if there is space. Returns `True` on success.
+        capacity = self.__capacity
+        if capacity is not None and self.__size >= capacity:
+            self.__num_dropped += 1
+            return False
+        qp = QueuedPacket(packet, arrived_at=stime)
+        if capacity is None:
+            self.__packets.append(qp)
+        else:
+            self.__ring[(self.__head + self.__size) % capacity] = qp
+        self.__size += 1
+        self.__bitsize += qp.size
+        return True
+
+    def __take(self):
+        # Remove the first packet, the queue MUST NOT be empty.
+        if self.__ring is None:
             qp = self.__packets.popleft()
-        except IndexError as err:
-            raise ValueError('pop from empty Queue') from err
         else:
-            self.__size_trace.record(self.sim.stime, len(self))
-            self.__bitsize_trace.record(self.sim.stime, self.bitsize())
-            self.__wait_intervals.append(self.sim.stime - qp.arrived_at)
-            return qp.packet
+            qp = self.__ring[self.__head]
+            self.__ring[self.__head] = None
+            self.__head = (self.__head + 1) % self.__capacity
+        self.__size -= 1
+        # Reset the sum when the queue is empty, so float sizes don't
+        # accumulate rounding errors:
+        self.__bitsize = self.__bitsize - qp.size if self.__size > 0 else 0
+        return qp
+
+    def _record_traces(self, stime):
+        if self.__trace_mode == 'all':
+            self.__size_trace.record(stime, self.__size)
+            self.__bitsize_trace.record(stime, self.__bitsize)
+        else:
+            pending = self.__pending_sample
+            if pending is not None and pending[0] != stime:
+                self.__flush_pending_sample()
+            self.__pending_sample = (stime, self.__size, self.__bitsize)
+
+    def __flush_pending_sample(self):
+        pending = self.__pending_sample
+        if pending is None:
+            return
+        self.__pending_sample = None
+        if (self.__trace_mode == 'change' and
+                pending[1:] == self.__last_sample[1:]):
+            return
+        stime, size, bitsize = pending
+        self.__size_trace.record(stime, size)
+        self.__bitsize_trace.record(stime, bitsize)
+        self.__last_sample = pending
 
     def get_next(self, service):
         connection = self._get_connection_to(service)
         if not self.empty():
             connection.send(self.pop())
         else:
-            self.__data_requests.append(connection)
+            if self.__pending_request is None:
+                self.__pending_request = connection
+            elif self.__data_requests is None:
+                self.__data_requests = deque((connection,))
+            else:
+                self.__data_requests.append(connection)
 
     def handle_message(self, message, connection=None, sender=None):
         self.push(message)
 
     def _get_connection_to(self, module):
-        for conn_name, peer in self.connections.as_dict().items():
-            if module == peer:
-                return self.connections[conn_name]
-        raise ValueError(f'connection to {module} not found')
+        try:
+            return self.__conn_cache[id(module)]
+        except KeyError:
+            pass
+        # Cache miss: connections may have been added since the last build,
+        # so rebuild the whole mapping once before giving up:
+        self.__conn_cache = {
+            id(peer): self.connections[conn_name]
+            for conn_name, peer in self.connections.as_dict().items()
+        }
+        try:
+            return self.__conn_cache[id(module)]
+        except KeyError:
+            raise ValueError(f'connection to {module} not found') from None
 
     def __str__(self):
         prefix = f'{self.parent}.' if self.parent is not None else ''
@@ -184,8 +339,9 @@ class SaturatedQueue(Queue):
     one of its connected services requests a packet with `q.get_next(service)`
     call, this queue calls `source.get_next()` for the new packet generation.
     """
-    def __init__(self, sim, source, capacity=None):
-        super().__init__(sim, capacity)
+    def __init__(self, sim, source, capacity=None, trace_mode='all',
+                 online_stats=False):
+        super().__init__(sim, capacity, trace_mode, online_stats)
         self.source = source
 
     def get_next(self, service):
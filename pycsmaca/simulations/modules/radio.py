@@ -1,13 +1,20 @@
+from math import hypot
+
 import numpy as np
-from numpy.linalg import norm
 from pydesim import Model
 
+from pycsmaca.utilities import is_debug_enabled
+
 
 class AirFrame:
+    __slots__ = ('__pdu', '__preamble', '__bitrate', '__duration')
+
     def __init__(self, pdu, preamble, bitrate):
         self.__pdu = pdu
         self.__preamble = preamble
         self.__bitrate = bitrate
+        # Frame is immutable, so its duration is computed only once:
+        self.__duration = pdu.size / bitrate + preamble
 
     @property
     def pdu(self):
@@ -23,7 +30,7 @@ class AirFrame:
 
     @property
     def duration(self):
-        return self.pdu.size / self.bitrate + self.preamble
+        return self.__duration
 
     def __str__(self):
         return f"Frame[{self.duration:.6f}s with {self.pdu}]"
@@ -47,7 +54,10 @@ class Radio(Model):
 
     Parameters:
 
-    - `position`: a 2-D tuple with radio module antenna coordinates.
+    - `position`: a 2-D tuple with radio module antenna coordinates. It is
+        always stored and returned as a tuple of floats. When it changes,
+        `ConnectionManager` is notified, so propagation delays are updated
+        for all radios (peers lists are kept).
 
 
     Event handlers:
@@ -80,7 +90,7 @@ class Radio(Model):
     ):
         super().__init__(sim)
         self.__connection_manager = conn_manager
-        self.__position = np.asarray(position)
+        self.__position = (float(position[0]), float(position[1]))
         self.__preamble = (
             preamble if preamble is not None else sim.params.preamble
         )
@@ -89,6 +99,19 @@ class Radio(Model):
             connection_radius if connection_radius is not None
             else sim.params.connection_radius
         )
+        self.__connection_radius_sq = self.__connection_radius ** 2
+        self.__inv_speed_of_light = 1.0 / sim.params.speed_of_light
+        # Kernel bindings, used on each event:
+        self.__schedule = sim.schedule
+        self.__debug = is_debug_enabled(sim.logger)
+        # Connected modules are resolved on the first access, since
+        # connections are set once when the interface is built:
+        self.__receiver = None
+        self.__transmitter = None
+        # Peers list and a parallel list of propagation delays to them,
+        # see `_get_peers_and_delays()`:
+        self.__peers = None
+        self.__peer_delays = []
         # Initialization:
         sim.schedule(0, self._register_at_connection_manager)
 
@@ -99,7 +122,10 @@ class Radio(Model):
     @position.setter
     def position(self, value):
         assert len(value) == 2
-        self.__position = np.asarray(value)
+        self.__position = (float(value[0]), float(value[1]))
+        self.invalidate_delays()
+        # Connection manager drops delays cached by peers:
+        self.__connection_manager.update_position(self)
 
     @property
     def preamble(self):
@@ -117,43 +143,77 @@ class Radio(Model):
     def connection_radius(self):
         return self.__connection_radius
 
+    @property
+    def connection_radius_sq(self):
+        return self.__connection_radius_sq
+
     @property
     def receiver(self):
-        return self.connections['receiver'].module
+        if self.__receiver is None:
+            self.__receiver = self.connections['receiver'].module
+        return self.__receiver
 
     @property
     def transmitter(self):
-        return self.connections['transmitter'].module
+        if self.__transmitter is None:
+            self.__transmitter = self.connections['transmitter'].module
+        return self.__transmitter
 
     def transmit(self, pdu):
-        frame = AirFrame(pdu, self.preamble, self.bitrate)
-        self.sim.logger.debug(f'transmitting frame: {frame}', src=self)
-        peers = self.connection_manager.get_peers(self)
-        for peer in peers:
-            distance = norm(self.position - peer.position)
-            delay = distance / self.sim.params.speed_of_light
-            self.sim.schedule(delay, peer.receive, args=(frame,))
-        self.sim.schedule(frame.duration, self.handle_frame_transmitted)
+        frame = AirFrame(pdu, self.__preamble, self.__bitrate)
+        if self.__debug:
+            self.sim.logger.debug(f'transmitting frame: {frame}', src=self)
+        # All peers receive the same frame, so a single arguments tuple is
+        # shared by all scheduled events:
+        schedule, args = self.__schedule, (frame,)
+        for peer, delay in zip(*self._get_peers_and_delays()):
+            schedule(delay, peer.receive, args=args)
+        schedule(frame.duration, self.handle_frame_transmitted)
         self.receiver.start_transmit()
 
     def receive(self, frame):
         """This method is called by peers when they send a frame to this radio.
         """
-        assert isinstance(frame, AirFrame)
         self.receiver.start_receive(frame.pdu)
-        self.sim.schedule(
+        self.__schedule(
             frame.duration, self.handle_frame_received, args=(frame,)
         )
 
     def handle_frame_received(self, frame):
-        assert isinstance(frame, AirFrame)
         self.receiver.finish_receive(frame.pdu)
 
     def handle_frame_transmitted(self):
-        self.sim.logger.debug('finished transmit', src=self)
+        if self.__debug:
+            self.sim.logger.debug('finished transmit', src=self)
         self.transmitter.finish_transmit()
         self.receiver.finish_transmit()
 
+    def invalidate_delays(self):
+        """Drop cached propagation delays, they are computed on next use."""
+        self.__peers = None
+
+    def _get_delay_to(self, peer):
+        (x, y), (peer_x, peer_y) = self.__position, peer.position
+        return hypot(x - peer_x, y - peer_y) * self.__inv_speed_of_light
+
+    def _get_peers_and_delays(self):
+        """Get peers list and a parallel list of propagation delays to them.
+
+        Delays are computed once per peer. The connection manager only
+        appends radios to the peers list when they register, so only delays
+        to new peers are computed. If the list was replaced (the radio
+        registered again) or `invalidate_delays()` was called (this radio
+        or one of its peers moved), delays are rebuilt.
+        """
+        peers = self.__connection_manager.get_peers(self)
+        delays = self.__peer_delays
+        if peers is not self.__peers:
+            self.__peers = peers
+            delays.clear()
+        if len(delays) < len(peers):
+            delays.extend(self._get_delay_to(p) for p in peers[len(delays):])
+        return peers, delays
+
     def _register_at_connection_manager(self):
         self.__connection_manager.add_radio(self)
 
@@ -165,20 +225,55 @@ class ConnectionManager(Model):
     def __init__(self, sim):
         super().__init__(sim)
         self.connected_radios = {}
+        # Positions and connection radii of registered radios are stored in
+        # arrays, so peers of a new radio are found by a single vectorized
+        # computation instead of a Python loop over all radios:
+        # Arrays grow by doubling their capacity, only the first
+        # `len(self.__radios)` rows are used:
+        self.__radios = []
+        self.__radio_index = {}
+        self.__positions = np.empty((16, 2))
+        self.__radii_sq = np.empty(16)  # squared connection radii
+        self.__debug = is_debug_enabled(sim.logger)
 
     def add_radio(self, radio):
-        if radio not in self.connected_radios:
+        position = np.asarray(radio.position, dtype=float)
+        is_new = radio not in self.__radio_index
+        if not is_new:
+            index = self.__radio_index[radio]
+            self.__positions[index] = position
+            self.__radii_sq[index] = radio.connection_radius_sq
+        else:
+            index = len(self.__radios)
+            if index == len(self.__radii_sq):
+                self.__positions = np.concatenate(
+                    (self.__positions, np.empty_like(self.__positions)))
+                self.__radii_sq = np.concatenate(
+                    (self.__radii_sq, np.empty_like(self.__radii_sq)))
+            self.__radio_index[radio] = index
+            self.__radios.append(radio)
+            self.__positions[index] = position
+            self.__radii_sq[index] = radio.connection_radius_sq
             self.connected_radios[radio] = []
 
-        peers = []
-        for peer in self.connected_radios.keys():
-            if peer == radio:
-                continue
-            d = norm(peer.position - radio.position)
-            if peer.connection_radius >= d and radio.connection_radius >= d:
-                peers.append(peer)
-                if radio not in self.connected_radios[peer]:
-                    self.connected_radios[peer].append(radio)
+        # Compare squared distances to avoid square roots:
+        num_radios = len(self.__radios)
+        diff = self.__positions[:num_radios] - position
+        distances_sq = np.einsum('ij,ij->i', diff, diff)
+        connected = (
+            (self.__radii_sq[:num_radios] >= distances_sq) &
+            (radio.connection_radius_sq >= distances_sq)
+        )
+        connected[index] = False
+
+        radios, connected_radios = self.__radios, self.connected_radios
+        peers = [radios[i] for i in np.flatnonzero(connected)]
+        for peer in peers:
+            # A new radio can not be in peers lists yet, so the linear
+            # membership check is needed only when a radio registers again:
+            if is_new or radio not in connected_radios[peer]:
+                connected_radios[peer].append(radio)
+            if self.__debug:
                 self.sim.logger.debug(
                     f'connected radio@{tuple(radio.position)} to '
                     f'radio@{tuple(peer.position)}',
@@ -187,6 +282,19 @@ class ConnectionManager(Model):
 
         self.connected_radios[radio] = peers
 
+    def update_position(self, radio):
+        """Update the stored position of the radio after it moved.
+
+        Propagation delays cached by the radio peers are dropped. Peers
+        lists are not changed, call `add_radio()` to reconnect the radio.
+        """
+        index = self.__radio_index.get(radio)
+        if index is None:
+            return  # not registered yet
+        self.__positions[index] = radio.position
+        for peer in self.connected_radios[radio]:
+            peer.invalidate_delays()
+
     def get_peers(self, radio):
         return self.connected_radios[radio]
 
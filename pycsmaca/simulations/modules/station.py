@@ -12,6 +12,21 @@ class Station(Model):
         network_service = NetworkService(sim)
         switch = NetworkSwitch(sim)
 
+        # Children are fixed after construction, so they are also stored
+        # in attributes to avoid children lookups in properties:
+        self.__source = source
+        self.__sink = sink
+        self.__network_service = network_service
+        self.__switch = switch
+        self.__interfaces = interfaces
+
+        # Inverse switching table `next_hop -> connection name`, built on
+        # demand and dropped when the table changes:
+        self.__next_hop_connections = None
+        switch.table.add_listener(self.__drop_next_hop_connections)
+        # Switch connections by `id(module)`, see `get_switch_connection_for`:
+        self.__switch_connections = {}
+
         # Registering children:
         if source is not None:
             self.children['source'] = source
@@ -30,26 +45,26 @@ class Station(Model):
     
     @property
     def source(self):
-        return self.children['source'] if 'source' in self.children else None
+        return self.__source
     
     @property
     def sink(self):
-        return self.children['sink']
+        return self.__sink
     
     @property
     def network_service(self):
-        return self.children['network_service']
+        return self.__network_service
     
     @property
     def switch(self):
-        return self.children['switch']
+        return self.__switch
     
     @property
     def interfaces(self):
-        return self.children['interfaces']
+        return self.__interfaces
 
     def get_interface_by_address(self, address):
-        for iface in self.children['interfaces']:
+        for iface in self.__interfaces:
             if iface.address == address:
                 return iface
 
@@ -58,40 +73,58 @@ class Station(Model):
         # If remote_sta is found in switching table, return the interface
         # described by it:
         #
+        table = self.__switch.table
+        next_hop_connections = self.__get_next_hop_connections()
         for remote_address in (nif.address for nif in remote_sta.interfaces):
-            if remote_address in self.switch.table:
-                conn_name = self.switch.table[remote_address].connection
-                return self.switch.connections[conn_name].module
-            for link in self.switch.table.as_dict().values():
-                if link[1] == remote_address:
-                    conn_name = link[0]
-                    return self.switch.connections[conn_name].module
+            link = table.get(remote_address)
+            if link is not None:
+                conn_name = link.connection
+            else:
+                conn_name = next_hop_connections.get(remote_address)
+            if conn_name is not None:
+                return self.__switch.connections[conn_name].module
 
         #
         # Otherwise, inspect neighbours:
         #
-        def test_parent_is_remote_sta(module):
-            if module.parent is None:
-                return False
-            return module.parent == remote_sta or test_parent_is_remote_sta(
-                module.parent)
-        for iface in self.interfaces:
+        for iface in self.__interfaces:
             if 'wire' in iface.connections:
-                peer = iface.connections['wire'].module
-                if test_parent_is_remote_sta(peer):
-                    return iface
+                ancestor = iface.connections['wire'].module.parent
+                while ancestor is not None:
+                    if ancestor is remote_sta:
+                        return iface
+                    ancestor = ancestor.parent
 
         #
         # If neither found, return None:
         #
         return None
 
+    def __get_next_hop_connections(self):
+        if self.__next_hop_connections is None:
+            # If several routes share the next hop, the first one is used:
+            next_hop_connections = {}
+            for conn_name, next_hop in self.__switch.table.as_dict().values():
+                next_hop_connections.setdefault(next_hop, conn_name)
+            self.__next_hop_connections = next_hop_connections
+        return self.__next_hop_connections
+
+    def __drop_next_hop_connections(self):
+        self.__next_hop_connections = None
+
     def get_switch_connection_for(self, iface):
-        for conn_name in self.switch.connections.names():
-            conn = self.switch.connections[conn_name]
-            if conn.module == iface:
-                return conn
-        return None
+        try:
+            return self.__switch_connections[id(iface)]
+        except KeyError:
+            pass
+        # Cache miss: rebuild the mapping, since connections may be added:
+        connections = self.__switch.connections
+        switch_connections = {}
+        for conn_name in connections.names():
+            conn = connections[conn_name]
+            switch_connections.setdefault(id(conn.module), conn)
+        self.__switch_connections = switch_connections
+        return switch_connections.get(id(iface))
 
     def __str__(self):
         suffix = ''
@@ -1,17 +1,19 @@
 from numpy import inf
 from pydesim import Model, Trace, Statistic
 
+from pycsmaca.utilities import OnlineStatistic, is_debug_enabled
+
 
 class WireFrame:
+    __slots__ = ('packet', 'duration', 'header_size', 'preamble', 'size')
+
     def __init__(self, packet, duration=0, header_size=0, preamble=0):
         self.packet = packet
         self.duration = duration
         self.header_size = header_size
         self.preamble = preamble
-
-    @property
-    def size(self):
-        return self.header_size + (self.packet.size if self.packet else 0)
+        # Frame size is computed once, when the frame is created:
+        self.size = header_size + (packet.size if packet else 0)
 
     def __str__(self):
         fields = ','.join([
@@ -58,8 +60,12 @@ class WiredTransceiver(Model):
     If `'up'` connection is defined, the received packets are sent through it.
     Otherwise, they are silently dropped. Typically, `'up'` connects a
     `NetworkSwitch` module, or parent `NetworkInterface`.
+
+    Service time is a `pydesim.Statistic`. If `online_stats` is `True`, it is
+    an `OnlineStatistic`, which keeps no samples (only mean and deviation).
     """
-    def __init__(self, sim, bitrate=inf, header_size=0, preamble=0, ifs=0):
+    def __init__(self, sim, bitrate=inf, header_size=0, preamble=0, ifs=0,
+                 online_stats=False):
         super().__init__(sim)
         self.bitrate = bitrate
         self.header_size = header_size
@@ -79,8 +85,15 @@ class WiredTransceiver(Model):
         self.__num_transmitted_bits = 0
         self.__tx_busy_trace = Trace()
         self.__tx_busy_trace.record(0, 0)
-        self.__service_time = Statistic()
+        self.__service_time = (
+            OnlineStatistic() if online_stats else Statistic())
         self.__service_started_at = None
+        self.__debug = is_debug_enabled(sim.logger)
+        # Message handlers by the name of the connection message came from:
+        self.__handlers = {
+            'queue': self._handle_queue_message,
+            'peer': self._handle_peer_message,
+        }
         # Initialization:
         self.sim.schedule(self.sim.stime, self.start)
 
@@ -141,56 +154,71 @@ class WiredTransceiver(Model):
         self.__started = True
 
     def handle_message(self, message, connection=None, sender=None):
-        if connection.name == 'queue':
-            if self.tx_busy:
-                raise RuntimeError('new NetworkPacket while another TX running')
-            duration = ((self.header_size + message.size) / self.bitrate +
-                        self.preamble)
-            frame = WireFrame(
-                packet=message, duration=duration, header_size=self.header_size,
-                preamble=self.preamble
-            )
-            self.connections['peer'].send(frame)
-            self.sim.schedule(duration, self.handle_tx_end)
-            self.__tx_frame = frame
-            self.__tx_busy_trace.record(self.sim.stime, 1)
-            self.__service_started_at = self.sim.stime
-            self.sim.logger.debug(f'start transmitting frame {frame}', src=self)
-        elif connection.name == 'peer':
-            self.sim.schedule(
-                message.duration, self.handle_rx_end, args=(message,)
-            )
-            self.__rx_frame = message
-            self.__rx_busy_trace.record(self.sim.stime, 1)
-            self.sim.logger.debug(f'start receiving frame {message}', src=self)
+        handler = self.__handlers.get(connection.name)
+        if handler is not None:
+            handler(message)
+
+    def _handle_queue_message(self, message):
+        if self.__tx_frame is not None or self.__wait_ifs:
+            raise RuntimeError('new NetworkPacket while another TX running')
+        sim = self.sim
+        stime = sim.stime
+        header_size, preamble = self.header_size, self.preamble
+        duration = (header_size + message.size) / self.bitrate + preamble
+        frame = WireFrame(
+            packet=message, duration=duration, header_size=header_size,
+            preamble=preamble
+        )
+        self.connections['peer'].send(frame)
+        sim.schedule(duration, self.handle_tx_end)
+        self.__tx_frame = frame
+        self.__tx_busy_trace.record(stime, 1)
+        self.__service_started_at = stime
+        if self.__debug:
+            sim.logger.debug(f'start transmitting frame {frame}', src=self)
+
+    def _handle_peer_message(self, message):
+        sim = self.sim
+        sim.schedule(message.duration, self.handle_rx_end, args=(message,))
+        self.__rx_frame = message
+        self.__rx_busy_trace.record(sim.stime, 1)
+        if self.__debug:
+            sim.logger.debug(f'start receiving frame {message}', src=self)
 
     def handle_tx_end(self):
-        self.sim.schedule(self.ifs, self.handle_ifs_end)
+        sim = self.sim
+        sim.schedule(self.ifs, self.handle_ifs_end)
         # Record statistics:
         self.__num_transmitted_packets += 1
         self.__num_transmitted_bits += self.__tx_frame.size
         # Update state variables:
         self.__wait_ifs = True
         self.__tx_frame = None
-        self.sim.logger.debug(f'finish transmitting, waiting IFS', src=self)
+        if self.__debug:
+            sim.logger.debug('finish transmitting, waiting IFS', src=self)
 
     def handle_ifs_end(self):
+        sim = self.sim
         self.__wait_ifs = False
         self.connections['queue'].module.get_next(self)
         # Record statistics:
-        self.__tx_busy_trace.record(self.sim.stime, 0)
-        self.__service_time.append(self.sim.stime - self.__service_started_at)
+        stime = sim.stime
+        self.__tx_busy_trace.record(stime, 0)
+        self.__service_time.append(stime - self.__service_started_at)
         self.__service_started_at = None
-        self.sim.logger.debug(f'IFS end, ready to transmit', src=self)
+        if self.__debug:
+            sim.logger.debug('IFS end, ready to transmit', src=self)
 
     def handle_rx_end(self, frame):
-        if 'up' in self.connections:
-            self.connections['up'].send(frame.packet)
+        connections = self.connections
+        if 'up' in connections:
+            connections['up'].send(frame.packet)
         self.__rx_frame = None
         self.__num_received_frames += 1
         self.__num_received_bits += frame.size
         self.__rx_busy_trace.record(self.sim.stime, 0)
-        self.sim.logger.debug(f'finish receiving frame', src=self)
+        if self.__debug:
+            self.sim.logger.debug('finish receiving frame', src=self)
 
     def __str__(self):
         prefix = f'{self.parent}.' if self.parent else ''
@@ -1,17 +1,21 @@
 import math
-from enum import Enum
 
-from numpy.random.mtrand import randint
+from numpy.random.mtrand import uniform
 from pydesim import Model, Statistic, Trace
 
-from pycsmaca.simulations.modules import NetworkPacket
+from pycsmaca.utilities import is_debug_enabled, OnlineStatistic
 
 
 class PDUBase:
-    class Type(Enum):
+    __slots__ = ()
+
+    class Type:
+        # Plain integers are compared much faster than `Enum` members:
         DATA = 0
         ACK = 1
 
+        NAMES = ('DATA', 'ACK')
+
     @property
     def size(self):
         raise NotImplementedError
@@ -33,12 +37,16 @@ class PDUBase:
 
 
 class DataPDU(PDUBase):
+    __slots__ = (
+        '__packet', '__sender', '__receiver', '__header_size', '__seqn',
+        '__size',
+    )
+
     def __init__(
             self, packet, header_size, seqn,
             sender_address=None,
             receiver_address=None,
     ):
-        assert isinstance(packet, NetworkPacket)
         self.__packet = packet
         self.__sender = (
             sender_address if sender_address is not None
@@ -50,6 +58,8 @@ class DataPDU(PDUBase):
         )
         self.__header_size = header_size
         self.__seqn = seqn
+        # PDU is immutable, so its size is computed only once:
+        self.__size = header_size + packet.size
 
     @property
     def packet(self):
@@ -61,11 +71,10 @@ class DataPDU(PDUBase):
 
     @property
     def size(self):
-        return self.header_size + self.packet.size
+        return self.__size
 
-    @property
-    def type(self):
-        return self.Type.DATA
+    # PDU type is a constant of the class, so it is read without a call:
+    type = PDUBase.Type.DATA
 
     @property
     def sender_address(self):
@@ -86,19 +95,23 @@ class DataPDU(PDUBase):
 
 
 class AckPDU(PDUBase):
+    __slots__ = (
+        '__header_size', '__ack_size', '__sender_address',
+        '__receiver_address', '__size',
+    )
+
     def __init__(self, header_size, ack_size, sender_address, receiver_address):
         self.__header_size = header_size
         self.__ack_size = ack_size
         self.__sender_address = sender_address
         self.__receiver_address = receiver_address
+        self.__size = header_size + ack_size
 
     @property
     def size(self):
-        return self.__header_size + self.__ack_size
+        return self.__size
 
-    @property
-    def type(self):
-        return self.Type.ACK
+    type = PDUBase.Type.ACK
 
     @property
     def sender_address(self):
@@ -120,10 +133,15 @@ class ChannelState(Model):
     def __init__(self, sim):
         super().__init__(sim)
         self._is_busy = False
+        # Connected modules are resolved on the first access, since
+        # connections are set once when the interface is built:
+        self.__transmitter = None
 
     @property
     def transmitter(self):
-        return self.connections['transmitter'].module
+        if self.__transmitter is None:
+            self.__transmitter = self.connections['transmitter'].module
+        return self.__transmitter
 
     def set_ready(self):
         self._is_busy = False
@@ -141,6 +159,18 @@ class ChannelState(Model):
         return f'{self.parent}.channel'
 
 
+def _flush_samples(samples, statistic):
+    """Move samples collected in a list to the statistic and return it.
+
+    Appending to a list is much cheaper than calling `Statistic.append()`
+    on each event, so per-event samples are moved in bulk when read.
+    """
+    for value in samples:
+        statistic.append(value)
+    samples.clear()
+    return statistic
+
+
 class Transmitter(Model):
     """Models transmitter module at MAC layer.
 
@@ -148,18 +178,32 @@ class Transmitter(Model):
     - `'channel'`: mandatory, to `Channel` instance;
     - `'radio'`: mandatory, to `Radio` module
     - `'queue'`: optional, to `Queue` module
+
+    Backoffs are drawn from the global NumPy random state, unless `rng`
+    (a `numpy.random.Generator`) is given.
+
+    Service time, retries and backoff statistics are `pydesim.Statistic`
+    objects. Samples are collected in plain lists and moved to statistics
+    when the properties are read. If `online_stats` is `True`, statistics
+    are `OnlineStatistic` accumulators instead: they keep no samples and
+    provide only mean, variance and standard deviation.
     """
-    class State(Enum):
+    class State:
+        # Plain integers are compared much faster than `Enum` members:
         IDLE = 0
         BUSY = 1
         BACKOFF = 2
         TX = 3
         WAIT_ACK = 4
 
+        NAMES = ('IDLE', 'BUSY', 'BACKOFF', 'TX', 'WAIT_ACK')
+
+    RANDOM_BATCH_SIZE = 4096
+
     def __init__(
             self, sim, address=None, phy_header_size=None, mac_header_size=None,
             ack_size=None, bitrate=None, preamble=None, max_propagation=0,
-
+            rng=None, online_stats=False,
     ):
         super().__init__(sim)
 
@@ -173,6 +217,8 @@ class Transmitter(Model):
             mac_header_size if mac_header_size is not None
             else sim.params.mac_header_size
         )
+        self.__data_header_size = (
+            self.__phy_header_size + self.__mac_header_size)
         self.__bitrate = bitrate if bitrate is not None else sim.params.bitrate
         self.__preamble = (
             preamble if preamble is not None else sim.params.preamble
@@ -182,7 +228,32 @@ class Transmitter(Model):
             ack_size if ack_size is not None else sim.params.ack_size
         )
 
+        # Simulation-wide constants, read once to avoid params lookups
+        # on each event:
+        self.__difs = sim.params.difs
+        self.__sifs = sim.params.sifs
+        self.__slot = sim.params.slot
+        self.__cwmin = sim.params.cwmin
+        self.__cwmax = sim.params.cwmax
+        # ACK timeout is SIFS plus ACK transmission with propagation:
+        self.__ack_timeout = self.__sifs + (
+            (self.__ack_size + self.__mac_header_size +
+             self.__phy_header_size) / self.__bitrate + self.__preamble +
+            6 * self.__max_propagation
+        )
+
+        # Kernel bindings, used on each event:
+        self.__schedule = sim.schedule
+        self.__debug = is_debug_enabled(sim.logger)
+
+        # Connected modules are resolved on the first access, since
+        # connections are set once when the interface is built:
+        self.__channel = None
+        self.__radio = None
+        self.__queue = None
+
         # State variables:
+        # - timeout: token of the scheduled timeout, see `_schedule_timeout()`
         self.timeout = None
         self.cw = 65536
         self.backoff = -1
@@ -190,13 +261,24 @@ class Transmitter(Model):
         self.pdu = None
         self.__state = Transmitter.State.IDLE
         self.__seqn = 0
+        # Uniform random numbers are drawn in batches, see `_draw_backoff()`:
+        self.__rand_buf = ()
+        self.__rand_index = 0
+        self.__timeout_seqn = 0
+        self.__backoff_started_at = None
+        self.__uniform = rng.random if rng is not None else uniform
 
         # Statistics:
-        self.backoff_vector = Statistic()
+        # - samples are appended to lists, see `_flush_samples()`:
+        stat_class = OnlineStatistic if online_stats else Statistic
+        self.__backoff_vector = stat_class()
+        self.__backoffs = []
         self.__start_service_time = None
-        self.service_time = Statistic()
+        self.__service_time = stat_class()
+        self.__service_times = []
         self.num_sent = 0
-        self.num_retries_vector = Statistic()
+        self.__num_retries_vector = stat_class()
+        self.__num_retries_list = []
         self.__busy_trace = Trace()
         self.__busy_trace.record(sim.stime, 0)
 
@@ -209,9 +291,10 @@ class Transmitter(Model):
 
     @state.setter
     def state(self, state):
-        if self.state != state:
+        if self.__debug and self.__state != state:
+            names = Transmitter.State.NAMES
             self.sim.logger.debug(
-                f'{self.state.name} -> {state.name}', src=self
+                f'{names[self.__state]} -> {names[state]}', src=self
             )
         self.__state = state
 
@@ -251,27 +334,46 @@ class Transmitter(Model):
     def busy_trace(self):
         return self.__busy_trace
 
+    @property
+    def backoff_vector(self):
+        return _flush_samples(self.__backoffs, self.__backoff_vector)
+
+    @property
+    def service_time(self):
+        return _flush_samples(self.__service_times, self.__service_time)
+
+    @property
+    def num_retries_vector(self):
+        return _flush_samples(
+            self.__num_retries_list, self.__num_retries_vector)
+
     @property
     def channel(self):
-        return self.connections['channel'].module
+        if self.__channel is None:
+            self.__channel = self.connections['channel'].module
+        return self.__channel
 
     @property
     def radio(self):
-        return self.connections['radio'].module
+        if self.__radio is None:
+            self.__radio = self.connections['radio'].module
+        return self.__radio
 
     @property
     def queue(self):
-        return self.connections['queue'].module
+        if self.__queue is None:
+            self.__queue = self.connections['queue'].module
+        return self.__queue
 
     def start(self):
         self.queue.get_next(self)
 
     def handle_message(self, packet, connection=None, sender=None):
         if connection.name == 'queue':
-            assert self.state == Transmitter.State.IDLE
+            assert self.__state == Transmitter.State.IDLE
 
-            self.cw = self.sim.params.cwmin
-            self.backoff = randint(0, self.cw)
+            self.cw = self.__cwmin
+            self.backoff = self._draw_backoff()
             self.num_retries = 1
 
             #
@@ -279,28 +381,26 @@ class Transmitter(Model):
             #
             self.pdu = DataPDU(
                 packet, seqn=self.__seqn,
-                header_size=self.phy_header_size + self.mac_header_size,
-                sender_address=self.address,
+                header_size=self.__data_header_size,
+                sender_address=self.__address,
                 receiver_address=packet.receiver_address
             )
             self.__seqn += 1
 
             self.__start_service_time = self.sim.stime
-            self.backoff_vector.append(self.backoff)
+            self.__backoffs.append(self.backoff)
             self.__busy_trace.record(self.sim.stime, 1)
 
-            self.sim.logger.debug(
-                f'backoff={self.backoff}; CW={self.cw},NR={self.num_retries}',
-                src=self
-            )
+            if self.__debug:
+                self.sim.logger.debug(
+                    f'backoff={self.backoff}; CW={self.cw},'
+                    f'NR={self.num_retries}', src=self
+                )
 
             if self.channel.is_busy:
                 self.state = Transmitter.State.BUSY
             else:
-                self.state = Transmitter.State.BACKOFF
-                self.timeout = self.sim.schedule(
-                    self.sim.params.difs, self.handle_backoff_timeout
-                )
+                self._start_backoff()
         else:
             raise RuntimeError(
                 f'unexpected handle_message({packet}, connection={connection}, '
@@ -308,41 +408,41 @@ class Transmitter(Model):
             )
 
     def channel_ready(self):
-        if self.state == Transmitter.State.BUSY:
-            self.timeout = self.sim.schedule(
-                self.sim.params.difs, self.handle_backoff_timeout
-            )
-            self.state = Transmitter.State.BACKOFF
+        if self.__state == Transmitter.State.BUSY:
+            self._start_backoff()
 
     def channel_busy(self):
-        if self.state == Transmitter.State.BACKOFF:
-            self.sim.cancel(self.timeout)
+        if self.__state == Transmitter.State.BACKOFF:
+            # Count slots passed since DIFS end. Each slot is counted when it
+            # starts, so the slot interrupted by the busy channel is lost:
+            elapsed = self.sim.stime - self.__backoff_started_at - self.__difs
+            if elapsed > 0:
+                num_passed = int(elapsed / self.__slot) + 1
+                self.backoff = max(self.backoff - num_passed, 0)
+            self._cancel_timeout()
             self.state = Transmitter.State.BUSY
 
     def finish_transmit(self):
-        if self.state == Transmitter.State.TX:
-            self.sim.logger.debug('TX finished', src=self)
-            ack_duration = (
-                (self.ack_size + self.mac_header_size + self.phy_header_size) /
-                self.bitrate + self.preamble + 6 * self.max_propagation
-            )
-            self.timeout = self.sim.schedule(
-                self.sim.params.sifs + ack_duration, self.handle_ack_timeout
-            )
+        if self.__state == Transmitter.State.TX:
+            if self.__debug:
+                self.sim.logger.debug('TX finished', src=self)
+            self._schedule_timeout(self.__ack_timeout, self.handle_ack_timeout)
             self.state = Transmitter.State.WAIT_ACK
 
     def acknowledged(self):
-        if self.state == Transmitter.State.WAIT_ACK:
-            self.sim.logger.debug('received ACK', src=self)
+        if self.__state == Transmitter.State.WAIT_ACK:
+            if self.__debug:
+                self.sim.logger.debug('received ACK', src=self)
 
-            self.sim.cancel(self.timeout)
+            self._cancel_timeout()
             self.pdu = None
             self.state = Transmitter.State.IDLE
 
             self.num_sent += 1
-            self.service_time.append(self.sim.stime - self.__start_service_time)
+            self.__service_times.append(
+                self.sim.stime - self.__start_service_time)
             self.__start_service_time = None
-            self.num_retries_vector.append(self.num_retries)
+            self.__num_retries_list.append(self.num_retries)
             self.num_retries = None
             self.__busy_trace.record(self.sim.stime, 0)
 
@@ -351,39 +451,80 @@ class Transmitter(Model):
             #
             self.queue.get_next(self)
 
-    def handle_ack_timeout(self):
-        assert self.state == Transmitter.State.WAIT_ACK
+    def handle_ack_timeout(self, token=None):
+        if token is not None and token != self.timeout:
+            return  # this timeout was cancelled
+        assert self.__state == Transmitter.State.WAIT_ACK
         self.num_retries += 1
-        self.cw = min(2 * self.cw, self.sim.params.cwmax)
-        self.backoff = randint(0, self.cw)
+        self.cw = min(2 * self.cw, self.__cwmax)
+        self.backoff = self._draw_backoff()
 
-        self.backoff_vector.append(self.backoff)
+        self.__backoffs.append(self.backoff)
 
-        self.sim.logger.debug(
-            f'backoff={self.backoff}; CW={self.cw}, NR={self.num_retries})',
-            src=self
-        )
+        if self.__debug:
+            self.sim.logger.debug(
+                f'backoff={self.backoff}; CW={self.cw}, '
+                f'NR={self.num_retries})',
+                src=self
+            )
 
         if self.channel.is_busy:
             self.state = Transmitter.State.BUSY
         else:
-            self.state = Transmitter.State.BACKOFF
-            self.timeout = self.sim.schedule(
-                self.sim.params.difs, self.handle_backoff_timeout
-            )
+            self._start_backoff()
+
+    def _start_backoff(self):
+        """Wait DIFS and the remaining backoff slots with a single timeout.
+
+        While in BACKOFF, `backoff` keeps the number of slots left at the
+        moment the countdown started. If the channel becomes busy, it is
+        updated in `channel_busy()` from the time passed.
+        """
+        self.__backoff_started_at = self.sim.stime
+        self.state = Transmitter.State.BACKOFF
+        self._schedule_timeout(
+            self.__difs + self.backoff * self.__slot,
+            self.handle_backoff_timeout
+        )
 
-    def handle_backoff_timeout(self):
-        if self.backoff == 0:
-            self.state = Transmitter.State.TX
+    def handle_backoff_timeout(self, token=None):
+        if token is not None and token != self.timeout:
+            return  # this timeout was cancelled
+        self.backoff = 0
+        self.state = Transmitter.State.TX
+        if self.__debug:
             self.sim.logger.debug(f'transmitting {self.pdu}', src=self)
-            self.radio.transmit(self.pdu)
-        else:
-            assert self.backoff > 0
-            self.backoff -= 1
-            self.timeout = self.sim.schedule(
-                self.sim.params.slot, self.handle_backoff_timeout
-            )
-            self.sim.logger.debug(f'backoff := {self.backoff}', src=self)
+        self.radio.transmit(self.pdu)
+
+    def _schedule_timeout(self, delay, handler):
+        """Schedule a timeout handler, which can be cancelled with
+        `_cancel_timeout()`.
+
+        Instead of removing the event from the kernel queue, each timeout
+        gets a new integer token. Handler is called with its token and
+        returns immediately if the token is not current anymore.
+        """
+        self.__timeout_seqn += 1
+        self.timeout = self.__timeout_seqn
+        self.__schedule(delay, handler, args=(self.timeout,))
+
+    def _cancel_timeout(self):
+        self.timeout = None
+
+    def _draw_backoff(self):
+        """Draw a random backoff uniformly distributed in `[0, cw)`.
+
+        Drawing scalars from NumPy one by one is dominated by the call
+        overhead, so uniform numbers are generated in batches of
+        `RANDOM_BATCH_SIZE` and consumed one per call.
+        """
+        if self.__rand_index >= len(self.__rand_buf):
+            self.__rand_buf = self.__uniform(
+                size=self.RANDOM_BATCH_SIZE).tolist()
+            self.__rand_index = 0
+        value = self.__rand_buf[self.__rand_index]
+        self.__rand_index += 1
+        return int(value * self.cw)
 
     def __str__(self):
         prefix = f'{self.parent}.' if self.parent else ''
@@ -399,7 +540,8 @@ class Receiver(Model):
     - `'transmitter'`
     - `'up'`:
     """
-    class State(Enum):
+    class State:
+        # Plain integers are compared much faster than `Enum` members:
         IDLE = 0
         RX = 1
         TX1 = 2
@@ -408,6 +550,10 @@ class Receiver(Model):
         WAIT_SEND_ACK = 5
         SEND_ACK = 6
 
+        NAMES = (
+            'IDLE', 'RX', 'TX1', 'TX2', 'COLLIDED', 'WAIT_SEND_ACK', 'SEND_ACK'
+        )
+
     def __init__(
             self, sim, address=None, sifs=None, phy_header_size=None,
             ack_size=None,
@@ -425,10 +571,28 @@ class Receiver(Model):
             ack_size if ack_size is not None else sim.params.ack_size
         )
 
+        # Kernel bindings, used on each event:
+        self.__schedule = sim.schedule
+        self.__debug = is_debug_enabled(sim.logger)
+
+        # Connected modules are resolved on the first access, since
+        # connections are set once when the interface is built:
+        self.__radio = None
+        self.__channel = None
+        self.__transmitter = None
+        self.__up = None
+
         # State variables:
         self.__state = Receiver.State.IDLE
-        self.__rxbuf = set()
+        self.__rxbuf_size = 0  # number of PDUs being received
+        if __debug__:
+            # PDUs themselves are tracked only to validate RX begin/end calls.
+            # There are rarely more than two of them, so a list is used:
+            self.__rxbuf = []
         self.__cur_tx_pdu = None
+        # ACKs are immutable and depend only on the receiver address, so
+        # one ACK PDU per receiver is created and reused:
+        self.__ack_pdus = {}
 
         # Statistics:
         self.__num_collisions = 0
@@ -448,10 +612,12 @@ class Receiver(Model):
             elif state == Receiver.State.IDLE:
                 self.__busy_trace.record(self.sim.stime, 0)
 
-            self.sim.logger.debug(
-                f'{self.__state.name} -> {state.name}', src=self
-            )
-            if state is Receiver.State.COLLIDED:
+            if self.__debug:
+                names = Receiver.State.NAMES
+                self.sim.logger.debug(
+                    f'{names[self.__state]} -> {names[state]}', src=self
+                )
+            if state == Receiver.State.COLLIDED:
                 self.__num_collisions += 1
             self.__state = state
 
@@ -462,6 +628,7 @@ class Receiver(Model):
     @address.setter
     def address(self, address):
         self.__address = address
+        self.__ack_pdus = {}
 
     @property
     def sifs(self):
@@ -496,19 +663,30 @@ class Receiver(Model):
 
     @property
     def radio(self):
-        return self.connections['radio'].module
+        if self.__radio is None:
+            self.__radio = self.connections['radio'].module
+        return self.__radio
 
     @property
     def channel(self):
-        return self.connections['channel'].module
+        if self.__channel is None:
+            self.__channel = self.connections['channel'].module
+        return self.__channel
 
     @property
     def transmitter(self):
-        return self.connections['transmitter'].module
+        if self.__transmitter is None:
+            self.__transmitter = self.connections['transmitter'].module
+        return self.__transmitter
 
     @property
     def up(self):
-        return self.connections['up'].module
+        return self.__get_up_connection().module
+
+    def __get_up_connection(self):
+        if self.__up is None:
+            self.__up = self.connections['up']
+        return self.__up
 
     @property
     def collision_probability(self):
@@ -518,38 +696,44 @@ class Receiver(Model):
         return 0
 
     def start_receive(self, pdu):
-        if pdu in self.__rxbuf:
-            self.sim.logger.error(
-                f"PDU {pdu} is already in the buffer:\n{self.__rxbuf}",
-                src=self
-            )
-            raise RuntimeError(f'PDU is already in the buffer, PDU={pdu}')
+        if __debug__:
+            if pdu in self.__rxbuf:
+                self.sim.logger.error(
+                    f"PDU {pdu} is already in the buffer:\n{self.__rxbuf}",
+                    src=self
+                )
+                raise RuntimeError(f'PDU is already in the buffer, PDU={pdu}')
+            self.__rxbuf.append(pdu)
 
-        if self.state is Receiver.State.IDLE and not self.__rxbuf:
+        if self.__state == Receiver.State.IDLE and self.__rxbuf_size == 0:
             self.state = Receiver.State.RX
             self.channel.set_busy()
 
-        elif (self.state is Receiver.State.RX or (
-                self.state is Receiver.State.IDLE and self.__rxbuf)):
+        elif (self.__state == Receiver.State.RX or (
+                self.__state == Receiver.State.IDLE and
+                self.__rxbuf_size > 0)):
             self.state = Receiver.State.COLLIDED
 
-        self.__rxbuf.add(pdu)
+        self.__rxbuf_size += 1
 
         # In all other states (e.g. TX2, WAIT_SEND_ACK, SEND_ACK) we just add
         # the packet to RX buffer.
 
     def finish_receive(self, pdu):
-        assert pdu in self.__rxbuf
-        self.__rxbuf.remove(pdu)
-
-        if self.state is Receiver.State.RX:
-            assert not self.__rxbuf
-            if pdu.receiver_address == self.address:
-                if pdu.type is DataPDU.Type.DATA:
+        if __debug__:
+            assert pdu in self.__rxbuf
+            self.__rxbuf.remove(pdu)
+        self.__rxbuf_size -= 1
+
+        if self.__state == Receiver.State.RX:
+            assert self.__rxbuf_size == 0
+            if pdu.receiver_address == self.__address:
+                pdu_type = pdu.type
+                if pdu_type == PDUBase.Type.DATA:
                     self.state = Receiver.State.WAIT_SEND_ACK
                     self.__cur_tx_pdu = pdu
-                    self.sim.schedule(self.sifs, self.handle_timeout)
-                elif pdu.type is DataPDU.Type.ACK:
+                    self.__schedule(self.__sifs, self.handle_timeout)
+                elif pdu_type == PDUBase.Type.ACK:
                     self.transmitter.acknowledged()
                     self.state = Receiver.State.IDLE
                     self.channel.set_ready()
@@ -559,8 +743,8 @@ class Receiver(Model):
                 self.state = Receiver.State.IDLE
                 self.channel.set_ready()
 
-        elif self.state is Receiver.State.COLLIDED:
-            if not self.__rxbuf:
+        elif self.__state == Receiver.State.COLLIDED:
+            if self.__rxbuf_size == 0:
                 self.state = Receiver.State.IDLE
                 self.channel.set_ready()
             # Otherwise stay in COLLIDED state
@@ -569,45 +753,50 @@ class Receiver(Model):
         # packet from the RX buffer.
 
     def start_transmit(self):
-        if self.state is Receiver.State.IDLE:
+        if self.__state == Receiver.State.IDLE:
             self.state = Receiver.State.TX1
 
-        elif self.state in (Receiver.State.RX, Receiver.State.COLLIDED):
+        elif self.__state in (Receiver.State.RX, Receiver.State.COLLIDED):
             self.state = Receiver.State.TX2
 
-        assert self.state is not self.state.WAIT_SEND_ACK
+        assert self.__state != Receiver.State.WAIT_SEND_ACK
 
     def finish_transmit(self):
-        if self.state is Receiver.State.TX1:
-            if self.__rxbuf:
+        if self.__state == Receiver.State.TX1:
+            if self.__rxbuf_size > 0:
                 self.channel.set_busy()
                 self.state = Receiver.State.COLLIDED
             else:
                 self.state = Receiver.State.IDLE
 
-        elif self.state is Receiver.State.TX2:
-            if self.__rxbuf:
+        elif self.__state == Receiver.State.TX2:
+            if self.__rxbuf_size > 0:
                 self.state = Receiver.State.COLLIDED
             else:
                 self.channel.set_ready()
                 self.state = Receiver.State.IDLE
 
-        elif self.state is Receiver.State.SEND_ACK:
+        elif self.__state == Receiver.State.SEND_ACK:
             payload = self.__cur_tx_pdu.packet
-            self.connections['up'].send(payload)
+            self.__get_up_connection().send(payload)
             self.__num_received += 1
             self.__cur_tx_pdu = None
             self.channel.set_ready()
             self.state = Receiver.State.IDLE
 
     def handle_timeout(self):
-        assert self.state is Receiver.State.WAIT_SEND_ACK
-        ack = AckPDU(
-            header_size=self.phy_header_size,
-            ack_size=self.ack_size,
-            sender_address=self.address,
-            receiver_address=self.__cur_tx_pdu.sender_address,
-        )
+        assert self.__state == Receiver.State.WAIT_SEND_ACK
+        receiver_address = self.__cur_tx_pdu.sender_address
+        try:
+            ack = self.__ack_pdus[receiver_address]
+        except KeyError:
+            ack = AckPDU(
+                header_size=self.phy_header_size,
+                ack_size=self.ack_size,
+                sender_address=self.address,
+                receiver_address=receiver_address,
+            )
+            self.__ack_pdus[receiver_address] = ack
         self.state = Receiver.State.SEND_ACK
         self.radio.transmit(ack)
 
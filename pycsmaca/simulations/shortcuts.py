@@ -1,4 +1,7 @@
 from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
 
 from .wireless_networks import CollisionDomainNetwork, \
     CollisionDomainSaturatedNetwork, WirelessHalfDuplexLineNetwork
@@ -9,6 +12,38 @@ from pydesim import simulate, Logger
 SPEED_OF_LIGHT = 299792458.0
 
 
+# Result classes are defined at module level, so results can be pickled
+# and returned from worker processes:
+SimRet = namedtuple('SimRet', ['clients', 'server', 'network'])
+CollisionDomainClient = namedtuple('CollisionDomainClient', [
+    'service_time', 'num_retries', 'queue_size', 'busy',
+    'source_intervals', 'num_packets_sent', 'queue_drop_ratio',
+    'queue_wait',
+])
+SaturatedClient = namedtuple('SaturatedClient', [
+    'service_time', 'num_retries', 'queue_size', 'busy',
+    'source_intervals', 'num_packets_sent',
+])
+WirelessServer = namedtuple('WirelessServer', [
+    'arrival_intervals', 'num_rx_collided', 'num_rx_success',
+    'num_packets_received', 'collision_ratio',
+])
+WirelessLineClient = namedtuple('WirelessLineClient', [
+    'service_time', 'num_retries', 'queue_size', 'tx_busy', 'rx_busy',
+    'source_intervals', 'num_packets_sent', 'delay', 'sid',
+    'arrival_intervals', 'queue_drop_ratio', 'collision_ratio',
+    'queue_wait',
+])
+WiredLineClient = namedtuple('WiredLineClient', [
+    'service_time', 'queue_size', 'tx_busy', 'rx_busy',
+    'source_intervals', 'num_packets_sent', 'delay', 'sid',
+    'arrival_intervals', 'queue_drop_ratio', 'queue_wait',
+])
+WiredServer = namedtuple('WiredServer', [
+    'arrival_intervals', 'num_packets_received',
+])
+
+
 def collision_domain_network(
         num_clients, payload_size, source_interval, ack_size, mac_header_size,
         phy_header_size, preamble, bitrate, difs, sifs, slot, cwmin, cwmax,
@@ -38,19 +73,8 @@ def collision_domain_network(
         ), loglevel=log_level
     )
 
-    simret_class = namedtuple('SimRet', ['clients', 'server', 'network'])
-    client_class = namedtuple('Client', [
-        'service_time', 'num_retries', 'queue_size', 'busy',
-        'source_intervals', 'num_packets_sent', 'queue_drop_ratio',
-        'queue_wait',
-    ])
-    server_class = namedtuple('Server', [
-        'arrival_intervals', 'num_rx_collided', 'num_rx_success',
-        'num_packets_received', 'collision_ratio',
-    ])
-
     clients = [
-        client_class(
+        CollisionDomainClient(
             service_time=cli.interfaces[0].transmitter.service_time,
             num_retries=cli.interfaces[0].transmitter.num_retries_vector,
             queue_size=cli.interfaces[0].queue.size_trace,
@@ -63,7 +87,7 @@ def collision_domain_network(
     ]
 
     srv = ret.data.server
-    server = server_class(
+    server = WirelessServer(
         arrival_intervals=srv.sink.arrival_intervals.statistic(),
         num_rx_collided=srv.interfaces[0].receiver.num_collisions,
         num_rx_success=srv.interfaces[0].receiver.num_received,
@@ -71,7 +95,7 @@ def collision_domain_network(
         collision_ratio=srv.interfaces[0].receiver.collision_ratio,
     )
 
-    return simret_class(clients=clients, server=server, network=ret.data)
+    return SimRet(clients=clients, server=server, network=ret.data)
 
 
 def collision_domain_saturated_network(
@@ -102,18 +126,8 @@ def collision_domain_saturated_network(
         ), loglevel=log_level
     )
 
-    simret_class = namedtuple('SimRet', ['clients', 'server', 'network'])
-    client_class = namedtuple('Client', [
-        'service_time', 'num_retries', 'queue_size', 'busy',
-        'source_intervals', 'num_packets_sent',
-    ])
-    server_class = namedtuple('Server', [
-        'arrival_intervals', 'num_rx_collided', 'num_rx_success',
-        'num_packets_received', 'collision_ratio',
-    ])
-
     clients = [
-        client_class(
+        SaturatedClient(
             service_time=cli.interfaces[0].transmitter.service_time,
             num_retries=cli.interfaces[0].transmitter.num_retries_vector,
             queue_size=cli.interfaces[0].queue.size_trace,
@@ -124,7 +138,7 @@ def collision_domain_saturated_network(
     ]
 
     srv = ret.data.server
-    server = server_class(
+    server = WirelessServer(
         arrival_intervals=srv.sink.arrival_intervals.statistic(),
         num_rx_collided=srv.interfaces[0].receiver.num_collisions,
         num_rx_success=srv.interfaces[0].receiver.num_received,
@@ -132,7 +146,34 @@ def collision_domain_saturated_network(
         collision_ratio=srv.interfaces[0].receiver.collision_ratio,
     )
 
-    return simret_class(clients=clients, server=server, network=ret.data)
+    return SimRet(clients=clients, server=server, network=ret.data)
+
+
+def _run_saturated_network(kwargs, seed):
+    np.random.seed(seed)
+    ret = collision_domain_saturated_network(**kwargs)
+    # The model itself is not sent back to the parent process:
+    return ret._replace(network=None)
+
+
+def collision_domain_saturated_network_batch(
+        params_list, num_workers=None, seed=None):
+    """Run `collision_domain_saturated_network()` in parallel processes.
+
+    :param params_list: iterable of dicts with keyword arguments for
+        `collision_domain_saturated_network()`, one per run;
+    :param num_workers: number of worker processes (default: CPUs number);
+    :param seed: seed used to derive independent seeds for all runs.
+    :return: list of `SimRet` in the order of `params_list`, with `network`
+        field set to `None`.
+    """
+    params_list = list(params_list)
+    seeds = [
+        int(seq.generate_state(1)[0])
+        for seq in np.random.SeedSequence(seed).spawn(len(params_list))
+    ]
+    with ProcessPoolExecutor(max_workers=num_workers) as executor:
+        return list(executor.map(_run_saturated_network, params_list, seeds))
 
 
 def wireless_half_duplex_line_network(
@@ -166,25 +207,13 @@ def wireless_half_duplex_line_network(
         ), loglevel=log_level
     )
 
-    simret_class = namedtuple('SimRet', ['clients', 'server', 'network'])
-    client_class = namedtuple('Client', [
-        'service_time', 'num_retries', 'queue_size', 'tx_busy', 'rx_busy',
-        'source_intervals', 'num_packets_sent', 'delay', 'sid',
-        'arrival_intervals', 'queue_drop_ratio', 'collision_ratio',
-        'queue_wait',
-    ])
-    server_class = namedtuple('Server', [
-        'arrival_intervals', 'num_rx_collided', 'num_rx_success',
-        'num_packets_received', 'collision_ratio',
-    ])
-
     # Helper lists and objects:
     _client_sources = [cli.source for cli in ret.data.clients]
     _client_ifaces = [cli.interfaces[0] for cli in ret.data.clients]
     _srv = ret.data.server
 
     clients = [
-        client_class(
+        WirelessLineClient(
             service_time=iface.transmitter.service_time,
             num_retries=iface.transmitter.num_retries_vector,
             queue_size=iface.queue.size_trace,
@@ -201,7 +230,7 @@ def wireless_half_duplex_line_network(
             queue_wait=iface.queue.wait_intervals,
         ) for src, iface in zip(_client_sources, _client_ifaces)
     ]
-    server = server_class(
+    server = WirelessServer(
         arrival_intervals=_srv.sink.arrival_intervals.statistic(),
         num_rx_collided=_srv.interfaces[0].receiver.num_collisions,
         num_rx_success=_srv.interfaces[0].receiver.num_received,
@@ -209,7 +238,7 @@ def wireless_half_duplex_line_network(
         collision_ratio=_srv.interfaces[0].receiver.collision_ratio,
     )
 
-    return simret_class(clients=clients, server=server, network=ret.data)
+    return SimRet(clients=clients, server=server, network=ret.data)
 
 
 def wired_line_network(
@@ -240,16 +269,6 @@ def wired_line_network(
         loglevel=log_level,
     )
 
-    simret_class = namedtuple('SimRet', ['clients', 'server', 'network'])
-    client_class = namedtuple('Client', [
-        'service_time', 'queue_size', 'tx_busy', 'rx_busy',
-        'source_intervals', 'num_packets_sent', 'delay', 'sid',
-        'arrival_intervals', 'queue_drop_ratio', 'queue_wait',
-    ])
-    server_class = namedtuple('Server', [
-        'arrival_intervals', 'num_packets_received',
-    ])
-
     # Helper lists and objects:
     _client_sources = [cli.source for cli in ret.data.clients]
     _client_ifaces = [(cli.interfaces[0], cli.interfaces[-1])
@@ -257,7 +276,7 @@ def wired_line_network(
     _srv = ret.data.server
 
     clients = [
-        client_class(
+        WiredLineClient(
             service_time=out_if.transceiver.service_time,
             queue_size=out_if.queue.size_trace,
             tx_busy=out_if.transceiver.tx_busy_trace,
@@ -272,9 +291,9 @@ def wired_line_network(
             queue_wait=out_if.queue.wait_intervals,
         ) for src, (inp_if, out_if) in zip(_client_sources, _client_ifaces)
     ]
-    server = server_class(
+    server = WiredServer(
         arrival_intervals=_srv.sink.arrival_intervals.statistic(),
         num_packets_received=_srv.sink.num_packets_received,
     )
 
-    return simret_class(clients=clients, server=server, network=ret.data)
+    return SimRet(clients=clients, server=server, network=ret.data)
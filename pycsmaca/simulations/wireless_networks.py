@@ -1,5 +1,6 @@
-from math import pi, cos, sin
+from math import pi
 
+import numpy as np
 from numpy.random.mtrand import uniform
 from pydesim import Model
 
@@ -22,6 +23,7 @@ class _HalfDuplexNetworkBase(Model):
         self.__stations = []
 
         conn_radius = sim.params.connection_radius
+        positions = self.get_positions(sim.params.num_stations)
         for i in range(sim.params.num_stations):
             # Building elementary components:
             source = self.create_source(i)
@@ -32,7 +34,7 @@ class _HalfDuplexNetworkBase(Model):
             radio = Radio(
                 sim, self.__conn_manager,
                 connection_radius=conn_radius,
-                position=self.get_position(i)
+                position=positions[i]
             )
 
             # Building wireless interfaces:
@@ -62,6 +64,12 @@ class _HalfDuplexNetworkBase(Model):
     def get_position(self, index):
         raise NotImplementedError
 
+    def get_positions(self, num_stations):
+        """Get positions of all stations. Override it when positions can be
+        computed at once, by default calls `get_position()` per station.
+        """
+        return [self.get_position(i) for i in range(num_stations)]
+
     def write_switch_table(self, index):
         raise NotImplementedError
 
@@ -236,10 +244,24 @@ class CollisionDomainNetwork(_HalfDuplexNetworkBase):
         return None
 
     def get_position(self, index):
+        x, y = self._draw_positions(1)[0]
+        return float(x), float(y)
+
+    def get_positions(self, num_stations):
+        """Draw positions of all stations at once.
+
+        Both `get_position()` and `get_positions()` use `_draw_positions()`.
+        Since all distances are drawn before all angles, positions differ
+        from those of per-station `get_position()` calls with the same seed.
+        """
+        return self._draw_positions(num_stations)
+
+    def _draw_positions(self, size):
         area_radius = self.sim.params.connection_radius / 2.1
-        distance, angle = uniform(0.1, 1) * area_radius, uniform(0, 2 * pi)
-        position = (distance * cos(angle), distance * sin(angle))
-        return position
+        distances = uniform(0.1, 1, size=size) * area_radius
+        angles = uniform(0, 2 * pi, size=size)
+        return np.column_stack(
+            (distances * np.cos(angles), distances * np.sin(angles)))
 
     def write_switch_table(self, index):
         if index > 0:
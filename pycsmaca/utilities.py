@@ -1,3 +1,5 @@
+from pydesim import Logger
+
 SPEED_OF_LIGHT = 299792458.0
 
 
@@ -39,6 +41,50 @@ class ReadOnlyDict:
         return self.__data.get(item, default)
 
 
+class OnlineStatistic:
+    """Statistic which stores only the number of samples, their mean and
+    the sum of squared deviations (Welford's method).
+
+    Unlike `pydesim.Statistic`, samples themselves are not stored, so
+    `append()` takes O(1) time and memory. Use it for statistics updated
+    on each event when only mean and deviation are needed.
+    """
+    __slots__ = ('__n', '__mean', '__m2')
+
+    def __init__(self):
+        self.__n = 0
+        self.__mean = 0.0
+        self.__m2 = 0.0
+
+    def append(self, value):
+        self.__n += 1
+        delta = value - self.__mean
+        self.__mean += delta / self.__n
+        self.__m2 += delta * (value - self.__mean)
+
+    def extend(self, values):
+        for value in values:
+            self.append(value)
+
+    def empty(self):
+        return self.__n == 0
+
+    def mean(self):
+        return self.__mean if self.__n > 0 else None
+
+    def var(self):
+        return self.__m2 / self.__n if self.__n > 0 else None
+
+    def std(self):
+        return self.var() ** 0.5 if self.__n > 0 else None
+
+    def __len__(self):
+        return self.__n
+
+    def __str__(self):
+        return f'OnlineStatistic{{n={self.__n}, mean={self.mean()}}}'
+
+
 def print_children(model):
     def get_all_leafs(module):
         children = [module]
@@ -48,3 +94,16 @@ def print_children(model):
 
     for m in get_all_leafs(model):
         print(str(m))
+
+
+def is_debug_enabled(logger):
+    """Check whether the logger prints DEBUG messages.
+
+    Modules call this once and skip building debug messages when it returns
+    `False`. If the level can not be checked (e.g. the logger is a mock),
+    debug logging is assumed to be enabled.
+    """
+    try:
+        return logger.level.value <= Logger.Level.DEBUG.value
+    except (AttributeError, TypeError):
+        return True
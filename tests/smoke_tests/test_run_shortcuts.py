@@ -130,6 +130,50 @@ def test_collision_domain_saturated_network():
     )
 
 
+def test_collision_domain_saturated_network_batch():
+    from pycsmaca.simulations.shortcuts import \
+        collision_domain_saturated_network_batch, SimRet
+    common = dict(
+        payload_size=100,
+        ack_size=ACK_SIZE,
+        mac_header_size=MAC_HEADER,
+        phy_header_size=PHY_HEADER,
+        preamble=PREAMBLE,
+        bitrate=BITRATE,
+        difs=DIFS,
+        sifs=SIFS,
+        slot=SLOT,
+        cwmin=CWMIN,
+        cwmax=CWMAX,
+        connection_radius=CONNECTION_RADIUS,
+        speed_of_light=SPEED_OF_LIGHT,
+        sim_time_limit=100,
+        log_level=Logger.Level.WARNING
+    )
+    params_list = [
+        dict(num_clients=1, **common),
+        dict(num_clients=3, **common),
+    ]
+
+    def summary(results):
+        return [
+            [(cli.num_packets_sent, cli.service_time.mean())
+             for cli in ret.clients]
+            for ret in results
+        ]
+
+    results = collision_domain_saturated_network_batch(
+        params_list, num_workers=1, seed=13)
+    other = collision_domain_saturated_network_batch(
+        params_list, num_workers=1, seed=13)
+
+    assert len(results) == len(params_list)
+    assert all(isinstance(ret, SimRet) for ret in results)
+    assert all(ret.network is None for ret in results)
+    assert [len(ret.clients) for ret in results] == [1, 3]
+    assert summary(results) == summary(other)
+
+
 @pytest.mark.repeat(5)
 def test_wireless_half_duplex_line_network():
     num_clients = randint(1, 10)
@@ -116,6 +116,161 @@ def test_random_source_can_use_finite_intervals_distributions():
     )
 
 
+class BatchDistribution:
+    """Distribution stub drawing values from a list, one by one or in batch.
+    """
+    def __init__(self, values):
+        self.values = list(values)
+        self.num_calls = 0
+        self.batch_sizes = []
+
+    def __call__(self):
+        self.num_calls += 1
+        return self.values.pop(0)
+
+    def generate(self, size):
+        self.batch_sizes.append(size)
+        batch, self.values = self.values[:size], self.values[size:]
+        return batch
+
+
+# noinspection PyProtectedMember
+def test_random_source_precompute_draws_values_in_batches():
+    """Validate precompute() uses `generate()` and keeps values order.
+    """
+    sim = Mock()
+    sim.stime = 0
+    data_size = BatchDistribution((10, 20, 30))
+    interval = BatchDistribution((34, 42, 55))
+    source = RandomSource(
+        sim, data_size=data_size, interval=interval, source_id=0,
+        dest_addr=1)
+    source.connections['network'] = Mock()
+    sim.schedule.assert_called_with(34, source._generate)
+
+    source.precompute(2)
+
+    source._generate()
+    sim.schedule.assert_any_call(42, source._generate)
+    source._generate()
+    sim.schedule.assert_any_call(55, source._generate)
+    source._generate()
+    assert source.data_size_stat.as_tuple() == (10, 20, 30)
+    assert data_size.num_calls == 0
+    assert data_size.batch_sizes == [2, 2]
+    assert interval.num_calls == 1  # the first interval drawn in constructor
+    assert interval.batch_sizes == [2, 2]  # the last batch is empty
+
+
+# noinspection PyProtectedMember
+def test_random_source_precompute_ignores_distributions_without_generate():
+    sim = Mock()
+    sim.stime = 0
+    source = RandomSource(
+        sim, data_size=(10, 20), interval=5, source_id=0, dest_addr=1)
+    source.connections['network'] = Mock()
+
+    source.precompute(10)
+
+    source._generate()
+    source._generate()
+    assert source.data_size_stat.as_tuple() == (10, 20)
+
+
+# noinspection PyProtectedMember
+def test_random_source_in_burst_mode_schedules_several_arrivals():
+    """Validate that in burst mode arrivals are scheduled ahead in bursts.
+    """
+    sim = Mock()
+    sim.stime = 0
+    source = RandomSource(
+        sim, data_size=123, interval=(1, 2, 3, 4, 5, 6), source_id=0,
+        dest_addr=1, burst=4)
+    source.connections['network'] = Mock()
+
+    delays = [c[0][0] for c in sim.schedule.call_args_list]
+    assert delays == [1, 3, 6, 10]
+    sim.schedule.reset_mock()
+
+    # After the first two arrivals there are still two events pending:
+    sim.stime = 1
+    source._generate()
+    sim.stime = 3
+    source._generate()
+    assert all(c[0][1] != source._generate
+               for c in sim.schedule.call_args_list)
+
+    # After the third one the burst is refilled with the remaining intervals:
+    sim.stime = 6
+    source._generate()
+    sim.schedule.assert_any_call(9, source._generate)
+    sim.schedule.assert_any_call(15, source._generate)
+
+
+# noinspection PyProtectedMember
+def test_random_source_with_unit_burst_keeps_generating():
+    """Validate that a burst of one arrival is refilled after each arrival.
+    """
+    sim = Mock()
+    sim.stime = 0
+    source = RandomSource(
+        sim, data_size=123, interval=(1, 2, 3, 4), source_id=0,
+        dest_addr=1, burst=1)
+    source.connections['network'] = Mock()
+    sim.schedule.assert_called_once_with(1, source._generate)
+
+    for t, next_delay in ((1, 2), (3, 3), (6, 4)):
+        sim.schedule.reset_mock()
+        sim.stime = t
+        assert source._generate()
+        sim.schedule.assert_any_call(next_delay, source._generate)
+
+    assert source.num_packets_sent == 3
+
+
+class CountingIterable:
+    """Finite iterable counting `next()` calls, including failed ones.
+    """
+    def __init__(self, values):
+        self.values = list(values)
+        self.num_draws = 0
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        self.num_draws += 1
+        if not self.values:
+            raise StopIteration
+        return self.values.pop(0)
+
+
+# noinspection PyProtectedMember
+def test_random_source_in_burst_mode_stops_when_data_size_exhausted():
+    """Validate that pending burst arrivals do nothing after data sizes end.
+    """
+    sim = Mock()
+    sim.stime = 0
+    data_size = CountingIterable((10, 20))
+    source = RandomSource(
+        sim, data_size=data_size, interval=1, source_id=0, dest_addr=1,
+        burst=4)
+    source.connections['network'] = Mock()
+    sim.schedule.reset_mock()
+
+    results = []
+    for t in (1, 2, 3, 4):
+        sim.stime = t
+        results.append(source._generate())
+
+    assert results == [True, True, False, False]
+    assert data_size.num_draws == 3
+    assert source.num_packets_sent == 2
+    assert source.data_size_stat.as_tuple() == (10, 20)
+    assert all(c[0][1] != source._generate
+               for c in sim.schedule.call_args_list)
+
+
 # noinspection PyProtectedMember
 def test_random_source_can_use_finite_data_size_distributions():
     """Validate that `RandomSource` will stop when data size is finite tuple.
@@ -2,11 +2,15 @@ from collections import namedtuple
 
 import pytest
 from numpy import asarray
+from scipy.sparse import csr_matrix
 from numpy.testing import assert_almost_equal, assert_allclose
 
+from pyqumo.distributions import Constant, SemiMarkovAbsorb
+
 from pycsmaca.analytic.bianchi import get_bianchi_model_parameters, \
     get_bianchi_chain_state_index, get_bianchi_slot_times, \
-    get_bianchi_time_matrix
+    get_bianchi_time_matrix, _generate_absorption_times, bianchi_time_batch, \
+    get_bianchi_collision_probability, get_bianchi_throughput, bianchi_time
 
 
 @pytest.mark.parametrize('num_clients, cwmin, cwmax, n, m, w, p, tau', [
@@ -109,3 +113,89 @@ def test_bianchi_matrix_m1():
     ])
 
     assert_allclose(mat, expected)
+
+
+@pytest.mark.parametrize('m, w, p', [(0, 4, 0.5), (2, 2, 0.2), (3, 8, 0.7)])
+def test_bianchi_sparse_matrix_equals_dense(m, w, p):
+    params = namedtuple('_P', ['m', 'W', 'p'])(m, w, p)
+    dense = get_bianchi_time_matrix(params)
+    sparse = get_bianchi_time_matrix(params, sparse=True)
+
+    assert sparse.shape == dense.shape
+    assert_allclose(sparse.toarray(), dense)
+
+
+def test_generate_absorption_times():
+    # Chain 2 -> 1 -> 0 -> (absorbing) with one second spent in states 1, 2
+    # and ten seconds spent in state 0. Start is uniform over all states.
+    mat = asarray([
+        [0, 0, 0],
+        [1, 0, 0],
+        [0, 1, 0],
+    ])
+    backoff, transmit = Constant(1), Constant(10)
+    samples = _generate_absorption_times(
+        mat, [0, 1, 1], (transmit, backoff), [1/3, 1/3, 1/3], 10000)
+
+    assert samples.shape == (10000,)
+    assert set(samples) == {10, 11, 12}
+    assert_almost_equal(samples.mean(), 11, decimal=1)
+
+
+
+def test_generate_absorption_times_keeps_sparse_matrix():
+    # Same chain with an explicit zero element in the CSR matrix, as
+    # produced by `get_bianchi_time_matrix()` when `p = 0`:
+    mat = csr_matrix(([1.0, 1.0, 0.0], ([1, 2, 2], [0, 1, 0])), shape=(3, 3))
+    backoff, transmit = Constant(1), Constant(10)
+    samples = _generate_absorption_times(
+        mat, [0, 1, 1], (transmit, backoff), [0, 0, 1], 100)
+
+    assert set(samples) == {12}
+    assert mat.nnz == 3
+
+
+def test_bianchi_time_batch_equals_scalar_model():
+    kwargs = dict(
+        payload_size=1000, ack_size=100, mac_header_size=50,
+        phy_header_size=25, preamble=0.01, bitrate=1000, difs=0.2,
+        sifs=0.1, slot=0.05, distance=100, c=1e5,
+    )
+    cwmin, cwmax = 4, 64
+    ret = bianchi_time_batch([1, 2, 5, 10, 30], cwmin=cwmin, cwmax=cwmax,
+                             **kwargs)
+    slot_times = get_bianchi_slot_times(
+        1000, 100, 50, 25, 0.01, 1000, 0.2, 0.1, 0.05, 100, 1e5)
+
+    for i, n in enumerate(ret.num_clients):
+        params = get_bianchi_model_parameters(n, cwmin, cwmax)
+        assert_almost_equal(ret.p[i], params.p)
+        assert_almost_equal(ret.tau[i], params.tau)
+        assert_almost_equal(
+            ret.p_collision[i], get_bianchi_collision_probability(params))
+        assert_almost_equal(ret.throughput[i], get_bianchi_throughput(
+            params, 1000, slot_times.empty.mean(), slot_times.data.mean(),
+            slot_times.collided.mean()
+        ))
+
+    # With a single client there are no collisions, so the service time
+    # is the mean backoff plus the data slot:
+    assert_almost_equal(
+        ret.mean[0], 0.05 * (cwmin - 1) / 2 + slot_times.data.mean())
+
+
+def test_bianchi_time_builds_process_on_demand():
+    kwargs = dict(
+        payload_size=1000, ack_size=100, mac_header_size=50,
+        phy_header_size=25, preamble=0.01, bitrate=1000, difs=0.2,
+        sifs=0.1, slot=0.05, cwmin=4, cwmax=64, distance=100, c=1e5,
+    )
+    ret = bianchi_time(num_clients=1, **kwargs)
+    expected = bianchi_time_batch([1], **kwargs)
+
+    assert_almost_equal(ret.mean, expected.mean[0], decimal=1)
+    assert_almost_equal(ret.p_collision, expected.p_collision[0])
+
+    process = ret.process
+    assert isinstance(process, SemiMarkovAbsorb)
+    assert ret.process is process
@@ -523,6 +523,33 @@ def test_network_switch_ignores_old_messages():
     sim.schedule.assert_not_called()
 
 
+
+def test_network_switch_accepts_any_first_osn_from_originator():
+    sim, ns, iface = Mock(), Mock(), Mock()
+    switch = NetworkSwitch(sim)
+
+    iface.address = 1
+    ns_rev_conn = Mock()
+    ns.connections.set = Mock(return_value=ns_rev_conn)
+
+    switch.connections.set('user', ns, rname='network')
+    iface_conn = switch.connections.set('iface', iface, reverse=False)
+
+    pkt_1 = NetworkPacket(destination_address=1, originator_address=5, osn=-3)
+    pkt_2 = NetworkPacket(destination_address=1, originator_address=5, osn=-3)
+
+    switch.handle_message(pkt_1, connection=iface_conn, sender=iface)
+    sim.schedule.assert_called_once_with(
+        0, ns.handle_message, args=(pkt_1,), kwargs={
+            'connection': ns_rev_conn, 'sender': switch,
+        }
+    )
+    sim.schedule.reset_mock()
+
+    switch.handle_message(pkt_2, connection=iface_conn, sender=iface)
+    sim.schedule.assert_not_called()
+
+
 def test_network_switch_updates_addresses_when_forwarding_packet():
     """Validate sender and receiver addresses are upon forwarding.
     """
@@ -557,3 +584,84 @@ def test_network_switch_updates_addresses_when_forwarding_packet():
     assert pkt.osn == 8
     assert pkt.originator_address == 5
     assert pkt.destination_address == 230
+
+
+def test_network_switch_uses_replaced_connection_after_invalidate_plan():
+    sim, ns, eth, wifi = Mock(), Mock(), Mock(), Mock()
+    switch = NetworkSwitch(sim)
+
+    eth.address = 1
+    eth_conn = Mock()
+    eth.connections.set = Mock(return_value=eth_conn)
+    wifi.address = 2
+    wifi_conn = Mock()
+    wifi.connections.set = Mock(return_value=wifi_conn)
+
+    user_conn = switch.connections.set('user', ns, reverse=False)
+    switch.connections.set('if0', eth, rname='network')
+    switch.table.add(10, connection='if0', next_hop=5)
+
+    pkt_1 = NetworkPacket(destination_address=10)
+    switch.handle_message(pkt_1, connection=user_conn, sender=ns)
+    sim.schedule.assert_called_with(
+        0, eth.handle_message, args=(pkt_1,), kwargs={
+            'connection': eth_conn, 'sender': switch,
+        }
+    )
+
+    # Replace the interface under the same connection name:
+    switch.connections.set('if0', wifi, rname='network')
+    switch.invalidate_plan()
+
+    pkt_2 = NetworkPacket(destination_address=10)
+    switch.handle_message(pkt_2, connection=user_conn, sender=ns)
+    sim.schedule.assert_called_with(
+        0, wifi.handle_message, args=(pkt_2,), kwargs={
+            'connection': wifi_conn, 'sender': switch,
+        }
+    )
+    assert pkt_2.sender_address == 2
+
+    # Address 1 is no longer local, address 2 is:
+    sim.schedule.reset_mock()
+    switch.handle_message(
+        NetworkPacket(destination_address=1), connection=user_conn, sender=ns)
+    sim.schedule.assert_not_called()
+    switch.handle_message(
+        NetworkPacket(destination_address=2), connection=user_conn, sender=ns)
+    sim.schedule.assert_called_once()
+
+
+def test_network_switch_detects_local_address_change():
+    sim, ns, eth = Mock(), Mock(), Mock()
+    switch = NetworkSwitch(sim)
+
+    ns_rev_conn = Mock()
+    ns.connections.set = Mock(return_value=ns_rev_conn)
+    eth.address = 1
+
+    switch.connections.set('user', ns, rname='network')
+    eth_conn = switch.connections.set('eth', eth, rname='network')
+
+    pkt_1 = NetworkPacket(destination_address=1)
+    switch.handle_message(pkt_1, connection=eth_conn, sender=eth)
+    sim.schedule.assert_called_once_with(
+        0, ns.handle_message, args=(pkt_1,), kwargs={
+            'connection': ns_rev_conn, 'sender': switch,
+        }
+    )
+    sim.schedule.reset_mock()
+
+    eth.address = 3  # no invalidate_plan() call is needed
+
+    switch.handle_message(
+        NetworkPacket(destination_address=1), connection=eth_conn, sender=eth)
+    sim.schedule.assert_not_called()
+
+    pkt_3 = NetworkPacket(destination_address=3)
+    switch.handle_message(pkt_3, connection=eth_conn, sender=eth)
+    sim.schedule.assert_called_once_with(
+        0, ns.handle_message, args=(pkt_3,), kwargs={
+            'connection': ns_rev_conn, 'sender': switch,
+        }
+    )
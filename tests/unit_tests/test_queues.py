@@ -7,6 +7,7 @@ from numpy.random.mtrand import uniform
 from pycsmaca.simulations.modules.app_layer import AppData
 from pycsmaca.simulations.modules.network_layer import NetworkPacket
 from pycsmaca.simulations.modules.queues import Queue, SaturatedQueue
+from pycsmaca.utilities import OnlineStatistic
 
 
 #############################################################################
@@ -154,6 +155,74 @@ def test_finite_queue_without_service_writes_statistics():
     assert q.num_dropped == 1
 
 
+@pytest.mark.parametrize('online_stats', [False, True])
+def test_queue_records_wait_intervals(online_stats):
+    packets = [NetworkPacket(data=AppData(0, 100, 0, 0)) for _ in range(2)]
+    sim = Mock()
+    sim.stime = 0
+    queue = Queue(sim, online_stats=online_stats)
+
+    sim.stime = 2
+    queue.push(packets[0])
+    sim.stime = 3
+    queue.push(packets[1])
+    sim.stime = 7
+    queue.pop()
+    queue.pop()
+
+    assert queue.wait_intervals.mean() == pytest.approx(4.5)
+    if online_stats:
+        assert isinstance(queue.wait_intervals, OnlineStatistic)
+    else:
+        assert queue.wait_intervals.as_tuple() == (5, 4)
+
+
+def test_queue_trace_modes_coalesce_and_skip_samples():
+    packets = [NetworkPacket(data=AppData(0, 100, 0, 0)) for _ in range(3)]
+    sim = Mock()
+    sim.stime = 0
+    coalescing = Queue(sim, trace_mode='coalesce')
+    changing = Queue(sim, capacity=1, trace_mode='change')
+
+    sim.stime = 5
+    for queue in (coalescing, changing):
+        queue.push(packets[0])
+        queue.push(packets[1])  # dropped by `changing`, nothing recorded
+    sim.stime = 7
+    for queue in (coalescing, changing):
+        queue.pop()
+
+    assert coalescing.size_trace.as_tuple() == ((0, 0), (5, 2), (7, 1))
+    assert coalescing.bitsize_trace.as_tuple() == ((0, 0), (5, 200), (7, 100))
+    assert changing.size_trace.as_tuple() == ((0, 0), (5, 1), (7, 0))
+
+    with pytest.raises(ValueError):
+        Queue(sim, trace_mode='unknown')
+
+
+def test_queue_change_trace_mode_skips_unchanged_merged_samples():
+    packet = NetworkPacket(data=AppData(0, 100, 0, 0))
+    sim = Mock()
+    sim.stime = 0
+    coalescing = Queue(sim, trace_mode='coalesce')
+    changing = Queue(sim, trace_mode='change')
+
+    # A packet is pushed and popped at the same time, so the merged sample
+    # is equal to the initial one:
+    sim.stime = 5
+    for queue in (coalescing, changing):
+        queue.push(packet)
+        queue.pop()
+
+    assert coalescing.size_trace.as_tuple() == ((0, 0), (5, 0))
+    assert changing.size_trace.as_tuple() == ((0, 0),)
+    assert changing.bitsize_trace.as_tuple() == ((0, 0),)
+
+    sim.stime = 8
+    changing.push(packet)
+    assert changing.size_trace.as_tuple() == ((0, 0), (8, 1))
+
+
 def test_infinite_queue_stores_many_enough_packets():
     n = 50
     packets = [
@@ -345,6 +414,102 @@ def test_queue_accepts_packets_on_handle_message_call():
     assert tuple(qp.packet for qp in queue.as_tuple()) == (pkt,)
 
 
+def test_push_many_serves_pending_request_and_stores_other_packets():
+    sim, service = Mock(), Mock()
+    sim.stime = 0
+
+    service_rev_conn = Mock()
+    service.connections.set = Mock(return_value=service_rev_conn)
+
+    queue = Queue(sim=sim)
+    queue.connections.set('service', service, rname='queue')
+    queue.get_next(service=service)
+
+    packets = [NetworkPacket(data=AppData(size=sz)) for sz in (100, 200)]
+    sim.stime = 5
+    queue.push_many(packets)
+
+    sim.schedule.assert_called_once_with(
+        0, service.handle_message, args=(packets[0],), kwargs={
+            'connection': service_rev_conn, 'sender': queue,
+        }
+    )
+    assert tuple(qp.packet for qp in queue.as_tuple()) == (packets[1],)
+    assert queue.num_arrived == 2
+    assert queue.size_trace.as_tuple() == ((0, 0), (5, 1))
+    assert queue.bitsize_trace.as_tuple() == ((0, 0), (5, 200))
+
+
+def test_push_many_drops_packets_exceeding_capacity():
+    sim = Mock()
+    sim.stime = 0
+    queue = Queue(sim, capacity=2)
+    packets = [NetworkPacket(data=AppData(size=sz)) for sz in (1, 2, 3)]
+
+    sim.stime = 4
+    queue.push_many(packets)
+
+    assert tuple(qp.packet for qp in queue.as_tuple()) == tuple(packets[:2])
+    assert queue.num_arrived == 3
+    assert queue.num_dropped == 1
+    assert queue.size_trace.as_tuple() == ((0, 0), (4, 2))
+
+    # If all packets are dropped, nothing is recorded:
+    sim.stime = 6
+    queue.push_many(packets[2:])
+    assert queue.num_dropped == 2
+    assert queue.size_trace.as_tuple() == ((0, 0), (4, 2))
+
+
+def test_pop_many_respects_max_num():
+    sim = Mock()
+    sim.stime = 0
+    queue = Queue(sim)
+    packets = [NetworkPacket(data=AppData(size=100)) for _ in range(3)]
+    queue.push_many(packets)
+
+    sim.stime = 3
+    assert queue.pop_many(0) == []
+    assert queue.pop_many(2) == packets[:2]
+    assert queue.pop_many(5) == packets[2:]
+    assert queue.pop_many() == []
+    assert queue.empty()
+    assert queue.size_trace.as_tuple() == ((0, 0), (0, 3), (3, 1), (3, 0))
+    assert queue.wait_intervals.as_tuple() == (3, 3, 3)
+
+    queue.push_many(packets)
+    assert queue.pop_many() == packets
+
+
+@pytest.mark.parametrize('trace_mode, size_trace, bitsize_trace', [
+    ('all', ((0, 0), (1, 2), (1, 1), (2, 2), (3, 0)),
+     ((0, 0), (1, 300), (1, 200), (2, 500), (3, 0))),
+    ('change', ((0, 0), (1, 1), (2, 2), (3, 0)),
+     ((0, 0), (1, 200), (2, 500), (3, 0))),
+    ('coalesce', ((0, 0), (1, 1), (2, 2), (3, 0)),
+     ((0, 0), (1, 200), (2, 500), (3, 0))),
+])
+def test_push_many_and_pop_many_record_traces(
+        trace_mode, size_trace, bitsize_trace):
+    sim = Mock()
+    sim.stime = 0
+    queue = Queue(sim, capacity=2, trace_mode=trace_mode)
+    packets = [
+        NetworkPacket(data=AppData(size=sz)) for sz in (100, 200, 300, 400)
+    ]
+
+    sim.stime = 1
+    queue.push_many(packets[:2])
+    queue.pop_many(1)
+    sim.stime = 2
+    queue.push_many(packets[2:])  # the last packet is dropped
+    sim.stime = 3
+    queue.pop_many()
+
+    assert queue.size_trace.as_tuple() == size_trace
+    assert queue.bitsize_trace.as_tuple() == bitsize_trace
+
+
 #############################################################################
 # TEST SaturatedQueue
 #############################################################################
@@ -0,0 +1,59 @@
+from unittest.mock import Mock
+
+import pytest
+
+from pycsmaca.simulations.modules.radio import Radio, ConnectionManager
+
+
+def create_sim():
+    sim = Mock()
+    sim.stime = 0
+    sim.params = Mock(
+        preamble=0, bitrate=1000, connection_radius=100, speed_of_light=1.0,
+    )
+    return sim
+
+
+def get_delays(sim, radio):
+    """Transmit from `radio` and return scheduled delays to peers receivers.
+    """
+    sim.schedule.reset_mock()
+    radio.transmit(Mock(size=100))
+    return {
+        c[0][1].__self__: c[0][0] for c in sim.schedule.call_args_list
+        if getattr(c[0][1], '__name__', None) == 'receive'
+    }
+
+
+#############################################################################
+# TEST Radio AND ConnectionManager
+#############################################################################
+def test_radio_move_after_registration_updates_delays_and_manager():
+    sim = create_sim()
+    manager = ConnectionManager(sim)
+    r1 = Radio(sim, manager, position=(0, 0))
+    r2 = Radio(sim, manager, position=(3, 4))
+    r3 = Radio(sim, manager, position=(6, 8))
+    for radio in (r1, r2, r3):
+        radio.connections['receiver'] = Mock()
+        radio.connections['transmitter'] = Mock()
+        manager.add_radio(radio)
+
+    assert get_delays(sim, r1) == {r2: pytest.approx(5), r3: pytest.approx(10)}
+    assert get_delays(sim, r2) == {r1: pytest.approx(5), r3: pytest.approx(5)}
+
+    r3.position = (0, 20)
+
+    # Delays to the moved radio are updated for all peers, and delays
+    # from it too:
+    assert get_delays(sim, r1) == {r2: pytest.approx(5), r3: pytest.approx(20)}
+    assert get_delays(sim, r2) == {
+        r1: pytest.approx(5), r3: pytest.approx(265 ** 0.5)}
+    assert get_delays(sim, r3) == {
+        r1: pytest.approx(20), r2: pytest.approx(265 ** 0.5)}
+
+    # New radios are connected using the new position: r4 reaches only r3
+    # at (0, 20), while the old position (6, 8) is too far:
+    r4 = Radio(sim, manager, position=(0, 25), connection_radius=6)
+    manager.add_radio(r4)
+    assert manager.get_peers(r4) == [r3]
@@ -1,6 +1,6 @@
 import pytest
 
-from pycsmaca.utilities import ReadOnlyDict
+from pycsmaca.utilities import ReadOnlyDict, OnlineStatistic
 
 
 ##############################################################################
@@ -67,3 +67,23 @@ def test_read_only_dict_provides_str():
     rod = ReadOnlyDict(data)
 
     assert str(rod) == ('RODict' + str(data))
+
+
+##############################################################################
+# TEST OnlineStatistic
+##############################################################################
+def test_online_statistic_computes_mean_and_std():
+    values = [2, 4, 4, 4, 5, 5, 7, 9]
+    stat = OnlineStatistic()
+
+    assert stat.empty()
+    assert stat.mean() is None
+
+    for value in values:
+        stat.append(value)
+
+    assert not stat.empty()
+    assert len(stat) == len(values)
+    assert stat.mean() == pytest.approx(5.0)
+    assert stat.var() == pytest.approx(4.0)
+    assert stat.std() == pytest.approx(2.0)
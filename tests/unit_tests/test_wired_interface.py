@@ -8,6 +8,7 @@ from pycsmaca.simulations.modules.network_layer import NetworkPacket
 from pycsmaca.simulations.modules.wired_interface import (
     WiredTransceiver, WireFrame, WiredInterface,
 )
+from pycsmaca.utilities import OnlineStatistic
 
 WIRE_FRAME_CLASS = 'pycsmaca.simulations.modules.wired_interface.WireFrame'
 
@@ -423,6 +424,33 @@ def test_wired_transceiver_records_tx_statistics(
     assert iface.tx_busy_trace.as_tuple() == tuple(expected_busy_trace)
 
 
+@pytest.mark.parametrize('online_stats', [False, True])
+def test_wired_transceiver_records_service_time(online_stats):
+    sim, receiver, queue = Mock(), Mock(), Mock()
+    sim.stime = 0
+
+    iface = WiredTransceiver(
+        sim, bitrate=100, header_size=0, preamble=0, ifs=0,
+        online_stats=online_stats)
+    iface.connections.set('peer', receiver, rname='peer')
+    queue_conn = iface.connections.set('queue', queue, reverse=False)
+
+    for t, size in ((0, 100), (5, 300)):
+        sim.stime = t
+        iface.handle_message(
+            NetworkPacket(data=AppData(size=size)), sender=queue,
+            connection=queue_conn)
+        sim.stime = t + size / 100
+        iface.handle_tx_end()
+        iface.handle_ifs_end()
+
+    assert iface.service_time.mean() == pytest.approx(2.0)
+    if online_stats:
+        assert isinstance(iface.service_time, OnlineStatistic)
+    else:
+        assert iface.service_time.as_tuple() == (1.0, 3.0)
+
+
 #############################################################################
 # TEST WiredInterface MODEL
 #############################################################################
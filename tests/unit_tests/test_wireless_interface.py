@@ -0,0 +1,113 @@
+from unittest.mock import Mock
+
+import pytest
+from numpy.random import default_rng
+
+from pycsmaca.simulations.modules.app_layer import AppData
+from pycsmaca.simulations.modules.network_layer import NetworkPacket
+from pycsmaca.simulations.modules.wireless_interface import Transmitter
+
+DIFS, SLOT = 25, 10
+
+
+def create_transmitter(**kwargs):
+    sim = Mock()
+    sim.stime = 0
+    sim.params = Mock(
+        difs=DIFS, sifs=5, slot=SLOT, cwmin=16, cwmax=1024,
+        phy_header_size=0, mac_header_size=0, bitrate=1000, preamble=0,
+        ack_size=10,
+    )
+    channel, radio, queue = Mock(), Mock(), Mock()
+    transmitter = Transmitter(sim, address=1, rng=default_rng(0), **kwargs)
+    transmitter.connections.set('channel', channel, reverse=False)
+    transmitter.connections.set('radio', radio, reverse=False)
+    queue_conn = transmitter.connections.set('queue', queue, reverse=False)
+    return sim, transmitter, channel, radio, queue_conn
+
+
+#############################################################################
+# TEST Transmitter BACKOFF
+#############################################################################
+# noinspection PyProtectedMember
+@pytest.mark.parametrize('busy_at, remaining_backoff', [
+    (110, 5),   # during DIFS, no slots passed
+    (142, 3),   # in the middle of the third slot (two slots passed before)
+    (170, 0),   # during the last slot
+])
+def test_transmitter_backoff_resumes_after_busy_channel(
+        busy_at, remaining_backoff):
+    sim, transmitter, channel, radio, queue_conn = create_transmitter()
+    packet = NetworkPacket(receiver_address=2, data=AppData(size=100))
+
+    # Receive a packet while the channel is busy, then start a backoff of
+    # five slots at t = 100. DIFS ends at 125, slots start at 125, 135, ...
+    channel.is_busy = True
+    sim.stime = 50
+    transmitter.handle_message(packet, connection=queue_conn)
+    assert transmitter.state == Transmitter.State.BUSY
+    transmitter.backoff = 5
+
+    sim.stime = 100
+    transmitter.channel_ready()
+    assert transmitter.state == Transmitter.State.BACKOFF
+    first_token = transmitter.timeout
+    sim.schedule.assert_called_with(
+        DIFS + 5 * SLOT, transmitter.handle_backoff_timeout,
+        args=(first_token,))
+
+    # Channel becomes busy, the countdown is frozen:
+    sim.stime = busy_at
+    transmitter.channel_busy()
+    assert transmitter.state == Transmitter.State.BUSY
+    assert transmitter.backoff == remaining_backoff
+
+    # Cancelled timeout is ignored:
+    sim.stime = 175
+    transmitter.handle_backoff_timeout(first_token)
+    assert transmitter.state == Transmitter.State.BUSY
+    radio.transmit.assert_not_called()
+
+    # When the channel is ready, the remaining slots are waited after DIFS:
+    sim.stime = 200
+    transmitter.channel_ready()
+    assert transmitter.state == Transmitter.State.BACKOFF
+    resumed_token = transmitter.timeout
+    sim.schedule.assert_called_with(
+        DIFS + remaining_backoff * SLOT, transmitter.handle_backoff_timeout,
+        args=(resumed_token,))
+
+    sim.stime = 200 + DIFS + remaining_backoff * SLOT
+    transmitter.handle_backoff_timeout(resumed_token)
+    assert transmitter.state == Transmitter.State.TX
+    assert transmitter.backoff == 0
+    radio.transmit.assert_called_once_with(transmitter.pdu)
+
+
+#############################################################################
+# TEST Transmitter STATISTICS
+#############################################################################
+@pytest.mark.parametrize('online_stats', [False, True])
+def test_transmitter_records_service_statistics(online_stats):
+    sim, transmitter, channel, radio, queue_conn = create_transmitter(
+        online_stats=online_stats)
+    channel.is_busy = False
+
+    sim.stime = 2
+    transmitter.handle_message(
+        NetworkPacket(receiver_address=2, data=AppData(size=100)),
+        connection=queue_conn)
+    backoff = transmitter.backoff
+    transmitter.handle_backoff_timeout(transmitter.timeout)
+    transmitter.finish_transmit()
+    sim.stime = 12
+    transmitter.acknowledged()
+
+    assert transmitter.service_time.mean() == pytest.approx(10)
+    assert transmitter.num_retries_vector.mean() == pytest.approx(1)
+    assert transmitter.backoff_vector.mean() == pytest.approx(backoff)
+    if not online_stats:
+        # Samples are moved to statistics only once:
+        assert transmitter.service_time.as_tuple() == (10,)
+        assert transmitter.num_retries_vector.as_tuple() == (1,)
+        assert transmitter.backoff_vector.as_tuple() == (backoff,)